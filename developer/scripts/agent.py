@@ -1,6 +1,8 @@
+import asyncio
+
 from dotenv import load_dotenv
 
-from git_bash_controller import list_git_bash_windows, get_git_status
+from git_bash_controller import list_git_bash_windows, get_git_status, get_git_status_of_all_windows, tool_cache, close_bash_sessions
 from langgraph.checkpoint.memory import InMemorySaver
 from langgraph.prebuilt import create_react_agent
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -13,26 +15,40 @@ model = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0)
 
 checkpointer = InMemorySaver()
 
+# Window list and git status rarely change between back-to-back questions:
+# reuse tool results for a few seconds within the same conversation thread.
+tool_cache.ttl = 15
+
 
 agent = create_react_agent(
     model=model,
     prompt=system_prompt,
-    tools=[list_git_bash_windows, get_git_status],
+    tools=[list_git_bash_windows, get_git_status, get_git_status_of_all_windows],
     checkpointer=checkpointer
 )
 
-response = agent.invoke(
-    {"messages": [{"role": "user", "content": "how many bash shells are open and what is the folder in which they are ?"}]},
-    config={"configurable": {"thread_id": "1"}},
-    context={"user_id": "1"}
-)
 
-print("Answer: ", response['messages'][-1].content)  
+async def main():
+    try:
+        response = await agent.ainvoke(
+            {"messages": [{"role": "user", "content": "how many bash shells are open and what is the folder in which they are ?"}]},
+            config={"configurable": {"thread_id": "1"}},
+            context={"user_id": "1"}
+        )
+
+        print("Answer: ", response['messages'][-1].content)
+
+        response = await agent.ainvoke(
+            {"messages": response['messages'] + [{"role": "user", "content": "can you see if there is any file ready to be committed in the Alfred project?"}]},
+            config={"configurable": {"thread_id": "1"}},
+            context={"user_id": "1"}
+        )
+
+        print("Answer: ", response['messages'][-1].content)
+    finally:
+        # Persistent bash processes are owned by this event loop
+        await close_bash_sessions()
 
-response = agent.invoke(
-    {"messages": response['messages'] + [{"role": "user", "content": "can you see if there is any file ready to be committed in the Alfred project?"}]},
-    config={"configurable": {"thread_id": "1"}},
-    context={"user_id": "1"}
-)
 
-print("Answer: ", response['messages'][-1].content)  
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -9,14 +9,97 @@ Dépendances :
 pip install pywin32 psutil langchain
 """
 
+import asyncio
+import ctypes
+import functools
 import json
-import subprocess
+import re
 import os
+import shlex
+import shutil
+import time
+import uuid
+import winreg
 import win32gui
 import win32process
 import psutil
-from typing import List, Dict, Any, Optional
+from collections import defaultdict, deque
+from ctypes import wintypes
+from typing import List, Dict, Any, Optional, Tuple, Callable, Awaitable
 from langchain.tools import tool
+from langchain_core.runnables import RunnableConfig
+
+# Commandes git qui modifient l'état du dépôt : elles invalident le cache de 'git status'
+GIT_WRITE_COMMAND_PATTERN = re.compile(
+    r"\bgit\s+(add|commit|reset|restore|checkout|switch|merge|rebase|pull|stash|rm|mv)\b"
+)
+
+
+class ToolResultCache:
+    """
+    Cache des résultats d'outils, par conversation (thread_id), avec une durée de vie (TTL).
+    Les clés sont de la forme (thread_id, nom de l'outil, arguments).
+    Désactivé par défaut (ttl=0) : l'agent l'active explicitement.
+    """
+
+    def __init__(self, ttl: float = 0.0):
+        self.ttl = ttl
+        self._entries: Dict[Tuple, Tuple[float, Any]] = {}
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.ttl:
+            self._entries.pop(key, None)
+            return None
+        return value
+
+    async def fetch(self, key: Tuple, compute: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Retourne (valeur, cached). Calcule et mémorise la valeur si elle est absente ou expirée.
+        Les erreurs ({"error": ...}) ne sont pas mémorisées : un nouvel appel peut réussir.
+        """
+        if self.ttl > 0:
+            value = self.get(key)
+            if value is not None:
+                return value, True
+        value = await compute()
+        if self.ttl > 0 and not (isinstance(value, dict) and "error" in value):
+            self._entries[key] = (time.monotonic(), value)
+        return value, False
+
+    def invalidate(self, tool_name: str, args: Optional[Tuple] = None) -> None:
+        """
+        Supprime les entrées d'un outil (toutes conversations confondues), éventuellement
+        restreintes à des arguments donnés.
+        """
+        for key in list(self._entries):
+            if key[1] == tool_name and (args is None or key[2] == args):
+                self._entries.pop(key, None)
+
+
+tool_cache = ToolResultCache()
+
+
+def _thread_id(config: Optional[RunnableConfig]) -> Optional[str]:
+    return (config or {}).get("configurable", {}).get("thread_id")
+
+
+def _normalize_cwd(cwd: str) -> str:
+    return os.path.normcase(os.path.normpath(cwd))
+
+
+def _mark_cached(data: Any, cached: bool) -> Any:
+    """
+    Ajoute 'cached: true' au(x) résultat(s) servi(s) depuis le cache.
+    """
+    if not cached:
+        return data
+    if isinstance(data, list):
+        return [{**item, "cached": True} for item in data]
+    return {**data, "cached": True}
 
 
 def convert_mingw_path_to_windows(path: str) -> str:
@@ -38,6 +121,74 @@ def convert_mingw_path_to_windows(path: str) -> str:
     return path # Retourne le chemin original s'il n'est pas dans le format attendu
 
 
+TH32CS_SNAPPROCESS = 0x00000002
+INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
+
+
+class PROCESSENTRY32W(ctypes.Structure):
+    _fields_ = [
+        ("dwSize", wintypes.DWORD),
+        ("cntUsage", wintypes.DWORD),
+        ("th32ProcessID", wintypes.DWORD),
+        ("th32DefaultHeapID", ctypes.c_size_t),
+        ("th32ModuleID", wintypes.DWORD),
+        ("cntThreads", wintypes.DWORD),
+        ("th32ParentProcessID", wintypes.DWORD),
+        ("pcPriClassBase", wintypes.LONG),
+        ("dwFlags", wintypes.DWORD),
+        ("szExeFile", wintypes.WCHAR * 260),
+    ]
+
+
+_kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+_kernel32.CreateToolhelp32Snapshot.argtypes = [wintypes.DWORD, wintypes.DWORD]
+_kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+_kernel32.Process32FirstW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+_kernel32.Process32FirstW.restype = wintypes.BOOL
+_kernel32.Process32NextW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+_kernel32.Process32NextW.restype = wintypes.BOOL
+_kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+_kernel32.CloseHandle.restype = wintypes.BOOL
+
+
+def snapshot_process_tree() -> Dict[int, List[Tuple[int, str]]]:
+    """
+    Construit la table ppid -> [(pid, nom de l'exécutable)] de tous les processus
+    à partir d'un seul instantané Toolhelp32, au lieu de parcourir tous les PID
+    du système pour chaque fenêtre (ce que fait psutil.Process.children).
+    """
+    children: Dict[int, List[Tuple[int, str]]] = defaultdict(list)
+    snapshot = _kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+    if snapshot == INVALID_HANDLE_VALUE:
+        raise ctypes.WinError(ctypes.get_last_error())
+    try:
+        entry = PROCESSENTRY32W()
+        entry.dwSize = ctypes.sizeof(PROCESSENTRY32W)
+        found = _kernel32.Process32FirstW(snapshot, ctypes.byref(entry))
+        while found:
+            children[entry.th32ParentProcessID].append((entry.th32ProcessID, entry.szExeFile))
+            found = _kernel32.Process32NextW(snapshot, ctypes.byref(entry))
+    finally:
+        _kernel32.CloseHandle(snapshot)
+    return children
+
+
+def iter_descendants(process_tree: Dict[int, List[Tuple[int, str]]], pid: int):
+    """
+    Parcourt en largeur les descendants de pid dans la table ppid -> enfants.
+    """
+    seen = {pid}
+    queue = deque([pid])
+    while queue:
+        for child_pid, child_name in process_tree.get(queue.popleft(), ()):
+            # Un PID réutilisé peut créer un cycle dans la table
+            if child_pid in seen:
+                continue
+            seen.add(child_pid)
+            queue.append(child_pid)
+            yield child_pid, child_name
+
+
 def get_git_bash_windows() -> List[Dict[str, Any]]:
     """
     Scanne les fenêtres et retourne une liste de dictionnaires contenant
@@ -45,6 +196,13 @@ def get_git_bash_windows() -> List[Dict[str, Any]]:
     Tente d'abord d'obtenir le CWD via psutil, puis se rabat sur l'analyse du titre.
     """
     bash_windows = []
+    # Un seul instantané des processus pour toute l'énumération des fenêtres
+    process_tree = snapshot_process_tree()
+    process_names = {
+        child_pid: child_name
+        for entries in process_tree.values()
+        for child_pid, child_name in entries
+    }
 
     def enum_windows_callback(hwnd, lParam):  # noqa: D401 unused lParam
         if win32gui.IsWindowVisible(hwnd):
@@ -52,15 +210,13 @@ def get_git_bash_windows() -> List[Dict[str, Any]]:
             if "MINGW64" in window_title or window_title.startswith('/'):
                 try:
                     _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                    process = psutil.Process(pid)
-                    if process.name().lower() == 'mintty.exe':
-                        children = process.children(recursive=True)
+                    if process_names.get(pid, '').lower() == 'mintty.exe':
                         cwd = "N/A"
                         # Itérer sur les enfants pour trouver un processus bash.exe accessible
-                        for child in children:
-                            if child.name().lower() == 'bash.exe':
+                        for child_pid, child_name in iter_descendants(process_tree, pid):
+                            if child_name.lower() == 'bash.exe':
                                 try:
-                                    possible_cwd = child.cwd()
+                                    possible_cwd = psutil.Process(child_pid).cwd()
                                     cwd = possible_cwd
                                     break 
                                 except (psutil.AccessDenied, psutil.NoSuchProcess):
@@ -85,6 +241,7 @@ def get_git_bash_windows() -> List[Dict[str, Any]]:
     return bash_windows
 
 
+@functools.lru_cache(maxsize=1)
 def find_git_bash_path() -> Optional[str]:
     """
     Tente de trouver le chemin de l'exécutable bash.exe de Git.
@@ -100,63 +257,223 @@ def find_git_bash_path() -> Optional[str]:
     if os.path.exists(possible_path_x86):
         return possible_path_x86
 
-    # Si on ne le trouve pas, on peut essayer de chercher dans le PATH, mais c'est moins fiable
-    # pour cet exemple, nous retournons None.
-    print("WARNING: Could not find Git's bash.exe in standard locations.")
+    # Installation "pour l'utilisateur courant" (sans droits administrateur)
+    possible_path_user = os.path.join(os.environ.get("LOCALAPPDATA", ""), "Programs", "Git", "bin", "bash.exe")
+    if os.environ.get("LOCALAPPDATA") and os.path.exists(possible_path_user):
+        return possible_path_user
+
+    # Chemin d'installation enregistré par l'installeur Git for Windows
+    registry_path = _find_git_bash_path_in_registry()
+    if registry_path:
+        return registry_path
+
+    # En dernier recours, le PATH (en écartant le bash.exe de WSL dans System32)
+    path_bash = shutil.which("bash.exe") or shutil.which("bash")
+    if path_bash and "system32" not in path_bash.lower():
+        return path_bash
+
+    print("WARNING: Could not find Git's bash.exe in standard locations, registry or PATH.")
     return None
 
 
-def run_command_in_cwd(cwd: str, command: str) -> Dict[str, Any]:
+def _find_git_bash_path_in_registry() -> Optional[str]:
+    """
+    Lit la clé InstallPath de Git for Windows (machine puis utilisateur).
+    """
+    for hive in (winreg.HKEY_LOCAL_MACHINE, winreg.HKEY_CURRENT_USER):
+        try:
+            with winreg.OpenKey(hive, r"SOFTWARE\GitForWindows") as key:
+                install_path, _ = winreg.QueryValueEx(key, "InstallPath")
+        except OSError:
+            continue
+        possible_path = os.path.join(install_path, "bin", "bash.exe")
+        if os.path.exists(possible_path):
+            return possible_path
+    return None
+
+
+class BashSession:
+    """
+    Processus bash.exe persistant : les commandes sont écrites sur son entrée standard
+    et leur sortie est lue jusqu'à une sentinelle, ce qui évite de relancer bash
+    (50 à 150 ms sous Windows) à chaque appel d'outil.
+    """
+
+    def __init__(self, git_bash_exe: str):
+        self.git_bash_exe = git_bash_exe
+        self._process: Optional[asyncio.subprocess.Process] = None
+        # Une seule commande à la fois par session
+        self._lock = asyncio.Lock()
+        self._sentinel = f"__ALFRED_EOF_{uuid.uuid4().hex}__"
+
+    async def _ensure_started(self) -> None:
+        if self._process is None or self._process.returncode is not None:
+            # On appelle bash.exe avec '-s' (et non git-bash.exe, qui se détache de la console)
+            # et sans drapeau de création pour que la sortie reste capturable.
+            self._process = await asyncio.create_subprocess_exec(
+                self.git_bash_exe, '-s', # '-s' : lit les commandes sur l'entrée standard
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                creationflags=0
+            )
+
+    async def _read_until_sentinel(self, stream: asyncio.StreamReader) -> Tuple[str, str]:
+        """
+        Lit le flux jusqu'à la sentinelle. Retourne (sortie, texte suivant la sentinelle).
+        """
+        lines = []
+        while True:
+            line = await stream.readline()
+            if not line:
+                raise ConnectionResetError("The bash session ended unexpectedly.")
+            text = line.decode('utf-8', errors='replace')
+            # La sortie de la commande peut ne pas se terminer par un saut de ligne
+            index = text.find(self._sentinel)
+            if index != -1:
+                lines.append(text[:index])
+                return "".join(lines), text[index + len(self._sentinel):].strip()
+            lines.append(text)
+
+    async def run(self, cwd: str, command: str, timeout: float) -> Dict[str, Any]:
+        async with self._lock:
+            await self._ensure_started()
+            # Sous-shell : un 'cd' ou un 'exit' dans la commande n'affecte pas la session
+            script = (
+                f"( cd -- {shlex.quote(cwd)} && {command}\n) < /dev/null\n"
+                f"__rc=$?; printf '%s%d\\n' '{self._sentinel}' \"$__rc\"; printf '%s\\n' '{self._sentinel}' >&2\n"
+            )
+            try:
+                self._process.stdin.write(script.encode('utf-8'))
+                await self._process.stdin.drain()
+                (stdout, returncode), (stderr, _) = await asyncio.wait_for(
+                    asyncio.gather(
+                        self._read_until_sentinel(self._process.stdout),
+                        self._read_until_sentinel(self._process.stderr),
+                    ),
+                    timeout
+                )
+            except BaseException:
+                # Session dans un état inconnu (commande bloquée, bash terminé...) : on repartira de zéro
+                await self.close()
+                raise
+            return {
+                "stdout": stdout,
+                "stderr": stderr,
+                "returncode": int(returncode)
+            }
+
+    async def close(self) -> None:
+        if self._process is not None and self._process.returncode is None:
+            self._process.kill()
+            await self._process.wait()
+        self._process = None
+
+
+# Une session bash par répertoire : les commandes de cwd différents restent parallèles
+_bash_sessions: Dict[str, BashSession] = {}
+
+
+async def close_bash_sessions() -> None:
+    """
+    Termine toutes les sessions bash persistantes.
+    """
+    sessions = list(_bash_sessions.values())
+    _bash_sessions.clear()
+    await asyncio.gather(*[session.close() for session in sessions])
+
+
+async def run_command_in_cwd(cwd: str, command: str, timeout: float = 60.0) -> Dict[str, Any]:
     """
     Exécute une commande en arrière-plan dans un répertoire de travail (cwd)
     spécifique en utilisant le bash de Git et retourne la sortie.
+    La commande est envoyée à une session bash persistante propre à ce cwd.
     """
     git_bash_exe = find_git_bash_path()
     if not git_bash_exe:
         return {"error": "Git Bash executable not found."}
 
-    try:
-        # Nous utilisons subprocess.run pour exécuter la commande de manière non-interactive.
-        # C'est la méthode la plus robuste pour capturer la sortie.
-        result = subprocess.run(
-            [git_bash_exe, '-c', command], # '-c' permet de passer une commande au shell bash
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            check=False, # Ne lève pas d'exception si la commande échoue
-            encoding='utf-8'
-        )
-        
-        return {
-            "stdout": result.stdout,
-            "stderr": result.stderr,
-            "returncode": result.returncode
-        }
-
-    except FileNotFoundError:
+    if not os.path.isdir(cwd):
         return {"error": f"Could not find the directory: {cwd}"}
+
+    if GIT_WRITE_COMMAND_PATTERN.search(command):
+        tool_cache.invalidate("get_git_status", (_normalize_cwd(cwd),))
+
+    key = _normalize_cwd(cwd)
+    session = _bash_sessions.get(key)
+    if session is None:
+        session = _bash_sessions[key] = BashSession(git_bash_exe)
+    try:
+        return await session.run(cwd, command, timeout)
+    except asyncio.TimeoutError:
+        return {"error": f"The command did not finish within {timeout}s: {command}"}
     except Exception as e:
         return {"error": f"An unexpected error occurred: {e}"}
 
 
+async def _git_status(cwd: str, thread_id: Optional[str] = None) -> Tuple[Dict[str, Any], bool]:
+    """
+    Exécute 'git status' dans cwd sans bloquer la boucle d'événements.
+    Retourne (sortie, cached).
+    """
+    key = (thread_id, "get_git_status", (_normalize_cwd(cwd),))
+    return await tool_cache.fetch(key, lambda: run_command_in_cwd(cwd, "git status"))
+
+
+async def _git_bash_windows(thread_id: Optional[str] = None) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Énumère les fenêtres Git Bash sans bloquer la boucle d'événements.
+    Retourne (fenêtres, cached).
+    """
+    key = (thread_id, "list_git_bash_windows", ())
+    return await tool_cache.fetch(key, lambda: asyncio.to_thread(get_git_bash_windows))
+
+
 @tool
-def get_git_status(cwd: str) -> str:
+async def get_git_status(cwd: str, config: RunnableConfig) -> str:
     """
     Exécute 'git status' dans le répertoire de travail spécifié (cwd) et
     retourne le résultat en JSON.
     """
-    output = run_command_in_cwd(cwd, "git status")
-    return json.dumps(output, ensure_ascii=False, indent=2)
+    output, cached = await _git_status(cwd, _thread_id(config))
+    return json.dumps(_mark_cached(output, cached), ensure_ascii=False, indent=2)
 
 
 @tool
-def list_git_bash_windows() -> str:
+async def get_git_status_of_all_windows(config: RunnableConfig) -> str:
+    """
+    Exécute 'git status' dans le répertoire de chaque fenêtre Git Bash ouverte
+    et retourne le résultat en JSON (une entrée par répertoire).
+    À préférer à plusieurs appels de get_git_status quand plusieurs fenêtres sont concernées.
+    """
+    thread_id = _thread_id(config)
+    windows, _ = await _git_bash_windows(thread_id)
+    # Plusieurs fenêtres peuvent partager le même répertoire : un seul 'git status' par cwd
+    cwds = list(dict.fromkeys(w['cwd'] for w in windows if os.path.isdir(w['cwd'])))
+    # Les appels sont indépendants : on les lance tous en parallèle
+    results = await asyncio.gather(*[_git_status(cwd, thread_id) for cwd in cwds])
+    data = [
+        {"cwd": cwd, "status": _mark_cached(output, cached)}
+        for cwd, (output, cached) in zip(cwds, results)
+    ]
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+@tool
+async def list_git_bash_windows(config: RunnableConfig) -> str:
     """
     Retourne une description JSON des fenêtres Git Bash visibles.
     Inclut le handle, le pid, le titre et le répertoire de travail de chaque fenêtre.
     """
-    data = get_git_bash_windows()
-    return json.dumps(data, ensure_ascii=False, indent=2)
+    data, cached = await _git_bash_windows(_thread_id(config))
+    return json.dumps(_mark_cached(data, cached), ensure_ascii=False, indent=2)
+
+
+async def _run_once(cwd: str, command: str) -> Dict[str, Any]:
+    try:
+        return await run_command_in_cwd(cwd, command)
+    finally:
+        await close_bash_sessions()
 
 
 if __name__ == "__main__":
@@ -179,7 +496,7 @@ if __name__ == "__main__":
             print(f"\n--- 2. Running 'git status' in the context of the first window ('{target_cwd}') ---")
             
             # On exécute la commande et on capture la sortie
-            status_result = run_command_in_cwd(target_cwd, "git status")
+            status_result = asyncio.run(_run_once(target_cwd, "git status"))
             
             print("\n--- Command Result ---")
             if status_result.get("error"):
@@ -1,5 +1,7 @@
 from __future__ import annotations
+import asyncio
 import logging
+import threading
 from impersonated.kokoro_tts import KokoroText2Speech 
 from impersonated.chatbot import ChatBot, BOT_NAME
 import sys
@@ -55,14 +57,49 @@ def parse_args():
     parser.add_argument("--lang-code", "-l", default="a", help="Kokoro language code (default: a)")
     return parser.parse_args()
 
-def conversation_loop(bot, tts): 
+async def ainput(prompt: str) -> str:
+    """
+    Reads a line from stdin without blocking the event loop.
+    Uses a daemon thread so a pending input() never delays interpreter exit.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def _set(setter, value):
+        if not future.done():
+            setter(value)
+
+    def _read():
+        try:
+            line = input(prompt)
+        except BaseException as e:  # EOFError / KeyboardInterrupt are forwarded to the caller
+            loop.call_soon_threadsafe(_set, future.set_exception, e)
+        else:
+            loop.call_soon_threadsafe(_set, future.set_result, line)
+
+    threading.Thread(target=_read, daemon=True).start()
+    return await future
+
+
+async def speak_stream(tts, sentences, previous=None):
+    # do not talk over the previous answer
+    if previous:
+        await previous
+    try:
+        await tts.aspeak_queue(sentences)
+    except Exception as e: 
+        logger.error(f"TTS playback failed: {e}")
+
+
+async def conversation_loop(bot, tts): 
     print(f"{BOT_NAME}. Type {{/exit, :q, quit, exit}} to quit.")
 
+    speaking = None
     while True:
 
-        # get user input
+        # get user input (the previous answer keeps playing meanwhile)
         try:
-            user_text = input("You: ").strip()
+            user_text = (await ainput("You: ")).strip()
         except (EOFError, KeyboardInterrupt):
             print()  
             break
@@ -73,17 +110,20 @@ def conversation_loop(bot, tts):
         if not user_text:
             continue
 
-        # compute answer
-        answer = bot.ask(user_text)
-        print(f"{BOT_NAME}: {answer}")
-
-        # convert to audio
-        try:
-            if tts:
-                tts.speak(answer)
-        except Exception as e: 
-            logger.error(f"TTS playback failed: {e}")
-
+        # compute answer, converting each sentence to audio as soon as it is generated
+        sentences = asyncio.Queue()
+        if tts:
+            speaking = asyncio.create_task(speak_stream(tts, sentences, previous=speaking))
+        print(f"{BOT_NAME}: ", end="", flush=True)
+        async for sentence in bot.astream_sentences(user_text):
+            print(sentence, end="", flush=True)
+            if sentence.strip():
+                sentences.put_nowait(sentence.strip())
+        print()
+        sentences.put_nowait(None)
+
+    if speaking:
+        await speaking
     print("Goodbye.")
 
 
@@ -107,5 +147,8 @@ if __name__ == "__main__":
         sys.exit(1)
 
     print(f"Using Kokoro lang_code={args.lang_code}")
-    conversation_loop(bot, tts)
+    try:
+        asyncio.run(conversation_loop(bot, tts))
+    except KeyboardInterrupt:
+        print("Goodbye.")
 
@@ -1,46 +1,78 @@
-import soundfile as sf
+import numpy as np
 import subprocess
-import io
 
 
-def play_audio_stream(audio_data, sample_rate):
+def _ffplay_command(sample_rate):
     """
-    Plays raw audio data by streaming it to ffplay.
-    The audio data is converted to WAV format in-memory.
+    ffplay command reading raw mono float32 PCM from standard input.
     """
-    command = [
+    return [
         "ffplay",
         "-nodisp",      # No graphical display
         "-autoexit",    # Exit when playback finishes
+        "-f", "f32le",  # Raw little-endian float32 samples, no container to decode
+        "-sample_rate", str(sample_rate),  # Raw PCM is mono by default
         "-i", "-"       # Read from standard input
     ]
 
-    # Create an in-memory binary buffer
-    buffer = io.BytesIO()
-
-    # Write the NumPy audio data to the buffer as a WAV file
-    sf.write(buffer, audio_data, sample_rate, format='WAV')
-
-    # Reset the buffer's position to the beginning
-    buffer.seek(0)
-
-    # Start the ffplay process
-    player_process = subprocess.Popen(
-        command,
-        stdin=subprocess.PIPE,
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL
-    )
-
-    try:
-        # Write the in-memory WAV file bytes to ffplay's stdin
-        player_process.stdin.write(buffer.read())
-        player_process.stdin.close()
-        player_process.wait()
-    except (BrokenPipeError, IOError):
-        # This can happen if ffplay is closed manually
-        print("Playback stopped or failed.")
-    finally:
-        # Ensure the process is terminated
-        if player_process.poll() is None:
-            player_process.terminate()
\ No newline at end of file
+
+def _to_pcm_bytes(audio_data):
+    """
+    Converts audio samples (NumPy array or CPU tensor) to raw float32 PCM bytes.
+    """
+    return np.ascontiguousarray(audio_data, dtype=np.float32).tobytes()
+
+
+class AudioStreamPlayer:
+    """
+    Long-lived ffplay process fed with raw PCM chunks as they become available.
+    Consecutive chunks play back-to-back without respawning the player.
+    """
+
+    def __init__(self, sample_rate):
+        self._process = subprocess.Popen(
+            _ffplay_command(sample_rate),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        self._broken = False
+
+    def write(self, audio_data):
+        if self._broken:
+            return
+        try:
+            self._process.stdin.write(_to_pcm_bytes(audio_data))
+            self._process.stdin.flush()
+        except (BrokenPipeError, IOError):
+            # This can happen if ffplay is closed manually
+            self._broken = True
+            print("Playback stopped or failed.")
+
+    def close(self):
+        """
+        Signals the end of the stream and waits for playback to finish.
+        """
+        try:
+            self._process.stdin.close()
+            self._process.wait()
+        except (BrokenPipeError, IOError):
+            print("Playback stopped or failed.")
+        finally:
+            # Ensure the process is terminated
+            if self._process.poll() is None:
+                self._process.terminate()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def play_audio_stream(audio_data, sample_rate):
+    """
+    Plays raw audio data by streaming it to ffplay as raw float32 PCM.
+    """
+    with AudioStreamPlayer(sample_rate) as player:
+        player.write(audio_data)
@@ -1,10 +1,13 @@
 import os
+import re
+from collections import deque
+from itertools import islice
 
 try:
     from langchain_google_genai import ChatGoogleGenerativeAI
 except ImportError as e:  # pragma: no cover
     raise SystemExit("Missing dependency 'langchain-google-genai'. Install it first.") from e
-from typing import List, Tuple
+from typing import AsyncIterator, Deque, List, Tuple
 
 import logging
 
@@ -17,12 +20,16 @@ SYSTEM_PROMPT = (
     "You are {bot_name}, the helpful assistant of the family. You respond in a concise and friendly manner. "
 ).format(bot_name=BOT_NAME)
 
+# End of a sentence (punctuation followed by whitespace) or of a line
+SENTENCE_BOUNDARY = re.compile(r"[.!?…]+[\"')\]]*\s+|\n+")
+
 
 class ChatBot:
     def __init__(self, model_name: str = "gemini-2.5-flash", history_max_size: int = 6, temperature: float = 0.7):
         self.model_name = model_name
         self.history_max_size = history_max_size
-        self.history: List[Tuple[str, str]] = []  # list of (role, content)
+        # (role, content) pairs; the deque drops the oldest turns by itself
+        self.history: Deque[Tuple[str, str]] = deque(maxlen=history_max_size * 2 + 4)
         api_key = os.getenv("GOOGLE_API_KEY")
         if not api_key:
             raise RuntimeError("GOOGLE_API_KEY not set in environment.")
@@ -31,23 +38,66 @@ class ChatBot:
     def _build_messages(self) -> List[Tuple[str, str]]:
         system_prompt = SYSTEM_PROMPT
         messages: List[Tuple[str, str]] = [("system", system_prompt)]
-        recent = self.history[-(self.history_max_size * 2):]
+        recent = islice(self.history, max(0, len(self.history) - self.history_max_size * 2), None)
         messages.extend(recent)
         return messages
 
+    def _extract_answer(self, resp) -> str:
+        if hasattr(resp, "content"):
+            return resp.content if isinstance(resp.content, str) else str(resp.content)
+        return str(resp)  # fallback
+
+    def _remember_answer(self, answer: str) -> None:
+        self.history.append(("ai", answer))
+
     def ask(self, user_text: str) -> str:
         self.history.append(("human", user_text))
         messages = self._build_messages()
         try:
-            resp = self.model.invoke(messages)
-            if hasattr(resp, "content"):
-                answer = resp.content if isinstance(resp.content, str) else str(resp.content)
-            else:  # fallback
-                answer = str(resp)
+            answer = self._extract_answer(self.model.invoke(messages))
         except Exception as e:  # noqa
             logger.error(f"LLM call failed: {e}")
             answer = "I'm sorry, I had an internal error generating a response."
-        self.history.append(("ai", answer))
-        if len(self.history) > self.history_max_size * 2 + 4:
-            self.history = self.history[-(self.history_max_size * 2 + 4):]
-        return answer
\ No newline at end of file
+        self._remember_answer(answer)
+        return answer
+
+    async def aask(self, user_text: str) -> str:
+        """Same as ask, but awaits the model so the caller's event loop keeps running (e.g. TTS playback)."""
+        self.history.append(("human", user_text))
+        messages = self._build_messages()
+        try:
+            answer = self._extract_answer(await self.model.ainvoke(messages))
+        except Exception as e:  # noqa
+            logger.error(f"LLM call failed: {e}")
+            answer = "I'm sorry, I had an internal error generating a response."
+        self._remember_answer(answer)
+        return answer
+
+    async def astream_sentences(self, user_text: str) -> AsyncIterator[str]:
+        """
+        Streams the answer sentence by sentence as tokens arrive, so speech can start
+        before the whole reply is generated. Yielded pieces keep their trailing whitespace:
+        joined together they reproduce the full answer.
+        """
+        self.history.append(("human", user_text))
+        messages = self._build_messages()
+        parts: List[str] = []
+        buffer = ""
+        try:
+            async for chunk in self.model.astream(messages):
+                buffer += self._extract_answer(chunk)
+                while match := SENTENCE_BOUNDARY.search(buffer):
+                    sentence, buffer = buffer[:match.end()], buffer[match.end():]
+                    parts.append(sentence)
+                    yield sentence
+        except Exception as e:  # noqa
+            logger.error(f"LLM call failed: {e}")
+            # The unfinished sentence is dropped; like ask, only the apology is remembered
+            answer = "I'm sorry, I had an internal error generating a response."
+            yield answer
+            self._remember_answer(answer)
+            return
+        if buffer:
+            parts.append(buffer)
+            yield buffer
+        self._remember_answer("".join(parts).strip())
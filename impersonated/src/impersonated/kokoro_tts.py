@@ -1,7 +1,9 @@
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from kokoro import KPipeline
 from IPython.display import display, Audio
-from .audio import play_audio_stream
+from .audio import AudioStreamPlayer
 
 import logging 
 logger = logging.getLogger(__name__)
@@ -23,6 +25,8 @@ class KokoroText2Speech:
         self.voice = voice
         self._pipeline = KPipeline(lang_code=lang_code)
         self.speed = speed
+        # Single playback worker: chunk i plays while chunk i+1 is being synthesized
+        self._player = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kokoro-playback")
         logger.info(f"Kokoro TTS initialized with voice={voice}, lang_code={lang_code}, speed={speed}")
 
     def speak(self, text: str):
@@ -39,10 +43,42 @@ class KokoroText2Speech:
         #     speed=1, split_pattern=r'\n+'
         # )
 
-        for i, (gs, ps, audio) in enumerate(generator):
-            print(i)  # i => index
-            print(gs) # gs => graphemes/text
-            # print(ps) # ps => phonemes
-            play_audio_stream(audio, 24000)
-            # display(Audio(data=audio, rate=24000, autoplay=i==0))
-            # sf.write(f'{i}.wav', audio, 24000) # save each audio file
\ No newline at end of file
+        # One ffplay process for the whole text: chunks are streamed to it as they are synthesized
+        with AudioStreamPlayer(24000) as player:
+            playback = None
+            for i, (gs, ps, audio) in enumerate(generator):
+                print(i)  # i => index
+                print(gs) # gs => graphemes/text
+                # print(ps) # ps => phonemes
+                # Keep at most one chunk being written and one synthesized: wait for the previous
+                # chunk before queuing this one so playback order is preserved
+                if playback is not None:
+                    playback.result()
+                playback = self._player.submit(player.write, audio)
+                # display(Audio(data=audio, rate=24000, autoplay=i==0))
+                # sf.write(f'{i}.wav', audio, 24000) # save each audio file
+            if playback is not None:
+                playback.result()
+
+    def _synthesize(self, text: str):
+        return [audio for _, _, audio in self._pipeline(text, voice=self.voice, speed=self.speed, split_pattern=r'\n+')]
+
+    async def aspeak_queue(self, sentences: asyncio.Queue):
+        """
+        Speaks sentences as they are pushed to the queue (None ends the stream), through a
+        single ffplay process: the first sentence plays while the next ones are still generated.
+        """
+        player = AudioStreamPlayer(24000)
+        playback = None
+        try:
+            while (sentence := await sentences.get()) is not None:
+                logger.info(f"Kokoro TTS speaking sentence of length {len(sentence)}")
+                for audio in await asyncio.to_thread(self._synthesize, sentence):
+                    if playback is not None:
+                        await asyncio.wrap_future(playback)
+                    playback = self._player.submit(player.write, audio)
+            if playback is not None:
+                await asyncio.wrap_future(playback)
+        finally:
+            # Waits for the end of playback: keep it off the event loop
+            await asyncio.to_thread(player.close)
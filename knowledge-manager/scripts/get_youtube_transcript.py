@@ -1,19 +1,46 @@
 import re
+import io
+import time
+import random
+import asyncio
+import functools
+import itertools
 import logging
+import aiofiles
 from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound
+from aiolimiter import AsyncLimiter
 from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.messages import AIMessage
 
 from pydantic import BaseModel, Field
 import os
 from dotenv import load_dotenv
-from urllib.parse import urlparse, parse_qs
+from urllib.parse import urlparse
 import argparse
 from typing import Optional
 from pathlib import Path
-import time
+import json
+
+from knowledge_manager.llm_cache import LLMCache
 
 load_dotenv()
 
+# Identical model calls (same model, prompt and temperature) are answered from a local cache,
+# within and across runs (e.g. re-running with --force on an unchanged transcript).
+# The file is opened on first use; set use_llm_cache to False (--no-cache) to always call the model.
+LLM_CACHE_PATH = ".llm_cache.sqlite"
+use_llm_cache = True
+_llm_cache: Optional[LLMCache] = None
+
+
+def _get_llm_cache() -> Optional[LLMCache]:
+    global _llm_cache
+    if not use_llm_cache:
+        return None
+    if _llm_cache is None:
+        _llm_cache = LLMCache(LLM_CACHE_PATH)
+    return _llm_cache
+
 # Configure logging: write to root 'alfred.log' (append mode) and also console
 logging.basicConfig(
     level=logging.INFO,
@@ -29,6 +56,27 @@ class TranscriptResponse(BaseModel):
     title: str = Field(description="Give a one-line title to the transcript.")
     transcript: str = Field(description="The corrected transcript text.")
 
+# ----------------- Model Helpers -----------------
+
+@functools.lru_cache(maxsize=None)
+def _get_base_model(model_name: str) -> ChatGoogleGenerativeAI:
+    """
+    One client per model name: its async gRPC channel (HTTP/2, multiplexed) is opened on first use
+    and shared by every concurrent call, whatever the temperature or output schema.
+    """
+    return ChatGoogleGenerativeAI(model=model_name, temperature=0)
+
+@functools.lru_cache(maxsize=8)
+def _get_chat_model(model_name: str, temperature: float, schema: Optional[type[BaseModel]] = None):
+    """
+    Ready-to-use model per (name, temperature, output schema), so the structured-output binding is built once.
+    """
+    model = _get_base_model(model_name)
+    if schema is not None:
+        model = model.with_structured_output(schema)
+    # Temperature is sent per call (generation_config reaches the chat model as first step), not via another client
+    return model.bind(generation_config={"temperature": temperature})
+
 # ----------------- Quota / Retry Helpers -----------------
 def _parse_retry_delay_seconds(msg: str) -> float:
     import re
@@ -40,79 +88,135 @@ def _parse_retry_delay_seconds(msg: str) -> float:
             return 10.0
     return 10.0
 
-def invoke_with_retry(model, messages, max_retries: int = 5, base_delay: float = 2.0):
+def _is_quota_error(emsg: str) -> bool:
+    return "Quota exceeded" in emsg or "rate limit" in emsg.lower()
+
+def _retry_delay_seconds(emsg: str, attempt: int, base_delay: float, max_delay: float = 60.0) -> float:
+    # Exponential backoff with full jitter, so concurrent workers don't retry in lockstep
+    delay = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+    if _is_quota_error(emsg):
+        # The reported quota window is a floor; jitter still spreads the workers past it
+        return max(_parse_retry_delay_seconds(emsg), delay) + random.uniform(0, base_delay)
+    return delay
+
+# Per model name: monotonic time before which calls should not be issued (set by quota errors),
+# so in-flight workers wait out the window instead of all failing against it
+_next_allowed_call_time: dict[str, float] = {}
+
+def _make_limiter(requests_per_minute: float) -> AsyncLimiter:
+    """One request every 60 / requests_per_minute seconds (also valid for rates below 1 per minute)."""
+    return AsyncLimiter(1, 60 / requests_per_minute)
+
+async def ainvoke_with_retry(model, messages, model_name: str = "", max_retries: int = 5, base_delay: float = 2.0):
+    """Invoke the model, retrying on failure; waits with asyncio.sleep so other calls keep running."""
     for attempt in range(1, max_retries + 1):
+        wait = _next_allowed_call_time.get(model_name, 0.0) - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
         try:
-            return model.invoke(messages)
+            return await model.ainvoke(messages)
         except Exception as e:  # noqa
             emsg = str(e)
-            if "Quota exceeded" in emsg or "rate limit" in emsg.lower():
-                delay = _parse_retry_delay_seconds(emsg)
-            else:
-                delay = base_delay * attempt
+            delay = _retry_delay_seconds(emsg, attempt, base_delay)
+            if _is_quota_error(emsg):
+                resume_at = time.monotonic() + delay
+                _next_allowed_call_time[model_name] = max(_next_allowed_call_time.get(model_name, 0.0), resume_at)
             if attempt == max_retries:
                 logging.error(f"Max retries reached. Failing. Last error: {emsg}")
                 raise
             logging.warning(f"Model call failed (attempt {attempt}/{max_retries}): {emsg} -> sleeping {delay:.1f}s")
-            time.sleep(delay)
+            await asyncio.sleep(delay)
+
+async def ainvoke_cached(model_name: str, temperature: float, messages, schema: Optional[type[BaseModel]] = None, max_retries: int = 5):
+    """
+    Invoke the model (with retry) unless an identical request was already answered.
+    Structured responses are stored as pydantic JSON, plain ones as the message content.
+    """
+    key = LLMCache.cache_key(model_name, messages, temperature, schema.__name__ if schema else None)
+    llm_cache = _get_llm_cache()
+    if llm_cache is not None:
+        cached = llm_cache.get(key)
+        if cached is not None:
+            logger.info(f"LLM cache hit ({model_name}, key={key[:12]})")
+            return schema.model_validate_json(cached) if schema else AIMessage(content=json.loads(cached))
+    model = _get_chat_model(model_name, temperature, schema)
+    resp = await ainvoke_with_retry(model, messages, model_name=model_name, max_retries=max_retries)
+    if llm_cache is not None:
+        llm_cache.set(key, resp.model_dump_json() if schema else json.dumps(resp.content))
+    return resp
 
 # ----------------- Chunking & Correction Helpers -----------------
 
+_PARA_RE = re.compile(r"\n{2,}")
+
+def _split_paragraphs(text: str) -> list[str]:
+    """Non-empty, stripped paragraphs (separated by two or more newlines)."""
+    # Plain str.split when every separator is exactly "\n\n" (the common case)
+    parts = text.split("\n\n") if "\n\n\n" not in text else _PARA_RE.split(text)
+    return list(filter(None, map(str.strip, parts)))
+
+def _paragraph_spans(text: str):
+    """Yield (start, end) offsets of non-empty, stripped paragraphs, without copying them."""
+    start = 0
+    for sep in _PARA_RE.finditer(text):
+        yield from _stripped_span(text, start, sep.start())
+        start = sep.end()
+    yield from _stripped_span(text, start, len(text))
+
+def _stripped_span(text: str, start: int, end: int):
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    if start < end:
+        yield start, end
+
+def _append_chunk(chunks: list[str], text: str, start: int, end: int, max_chars: int) -> None:
+    # One slice per chunk; hard slice if still too large (very long paragraph)
+    for i in range(start, end, max_chars):
+        chunks.append(text[i:min(i + max_chars, end)])
+
 def split_text_into_chunks(text: str, max_chars: int) -> list[str]:
     """
     Split transcript into chunks not exceeding max_chars by grouping paragraphs.
     Paragraph = separated by two or more newlines. Falls back to raw slicing if needed.
+    Chunks are slices of the original text (paragraph separators kept as-is).
     """
     if len(text) <= max_chars:
         return [text]
-    
-    paragraphs = [p.strip() for p in re.split(r"\n{2,}", text) if p.strip()]
+
     chunks: list[str] = []
-    current: list[str] = []
-    current_len = 0
-    for para in paragraphs:
-        add_len = len(para) + 2  # account for joins
-        if current and current_len + add_len > max_chars:
-            chunks.append("\n\n".join(current))
-            current = [para]
-            current_len = len(para)
-        else:
-            current.append(para)
-            current_len += add_len
-    if current:
-        chunks.append("\n\n".join(current))
-
-    # Fallback slicing if any chunk still too large (very long paragraph)
-    final: list[str] = []
-    for c in chunks:
-        if len(c) <= max_chars:
-            final.append(c)
-        else:
-            # hard slice
-            for i in range(0, len(c), max_chars):
-                final.append(c[i:i+max_chars])
-    return final
+    chunk_start = chunk_end = -1
+    for para_start, para_end in _paragraph_spans(text):
+        if chunk_start < 0:
+            chunk_start = para_start
+        elif para_end - chunk_start > max_chars:
+            _append_chunk(chunks, text, chunk_start, chunk_end, max_chars)
+            chunk_start = para_start
+        chunk_end = para_end
+    if chunk_start >= 0:
+        _append_chunk(chunks, text, chunk_start, chunk_end, max_chars)
+    return chunks
 
 # New helper to format chunk diagnostics
 def _describe_chunks(chunks: list[str]) -> str:
     sizes = [len(c) for c in chunks]
     return " | ".join(f"{i+1}:{sz}" for i, sz in enumerate(sizes))
 
-def generate_title(corrected_full: str) -> str:
+async def generate_title(corrected_full: str) -> str:
     """
     Generate a single concise title for the full corrected transcript.
     """
     try:
-        model = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0)
         prompt = (
             "You will receive a corrected transcript of a technical / informational video. "
             "Return ONLY a single concise title (max ~12 words). No quotes, no punctuation at end.\n\n"
             f"Transcript:\n{corrected_full[:25000]}"  # safety truncation
         )
-        resp = model.invoke([
+        resp = await ainvoke_cached("gemini-2.0-flash", 0, [
             ("system", "Generate only a terse, human-friendly title."),
             ("human", prompt),
-        ])
+        ], max_retries=1)
         content = getattr(resp, "content", str(resp)).strip()
         # One line only
         return content.splitlines()[0][:120]
@@ -120,76 +224,102 @@ def generate_title(corrected_full: str) -> str:
         logger.error(f"Title generation failed: {e}")
         return "Transcript"
 
-def correct_transcript(raw_text: str, model_name: str = "gemini-2.0-flash") -> TranscriptResponse:
+async def correct_transcript(raw_text: str, model_name: str = "gemini-2.0-flash") -> TranscriptResponse:
     """
     Chunk large transcripts and correct each chunk individually to mitigate API length/rate issues.
     Aggregates corrected chunks and generates a unified title.
     """
     logger.info("Initializing model for transcript correction...")
-    model = ChatGoogleGenerativeAI(model=model_name, temperature=0)
-    model = model.with_structured_output(TranscriptResponse)
     messages = [
         ("system", "You are a special agent analyst for the NSA. Our system retrieved partial information from a video. The video transcript you are given has lots of errors due to the technical limitations of our recording system. Understand the text and fix the errors. Add some line breaks and section titles, so that the document is actually readable."),
         ("human", "Transcript:\n\n" + raw_text),
     ]
     logger.info("Invoking correction model (with retry)...")
-    return invoke_with_retry(model, messages)
+    return await ainvoke_cached(model_name, 0, messages, schema=TranscriptResponse)
 
-def correct_transcript_chunked(raw_text: str, chunk_size: int, model_name: str = "gemini-2.0-flash", per_chunk_sleep: float = 0.0, log_chunks: bool = False) -> TranscriptResponse:
+async def correct_transcript_chunked(
+    raw_text: str,
+    chunk_size: int,
+    model_name: str = "gemini-2.0-flash",
+    max_concurrency: int = 4,
+    requests_per_minute: float = 15,
+    log_chunks: bool = False
+) -> TranscriptResponse:
     """
     Chunk large transcripts and correct each chunk individually to mitigate API length/rate issues.
-    Aggregates corrected chunks and generates a unified title.
+    Chunks are corrected concurrently (at most max_concurrency in flight, paced to requests_per_minute).
+    Aggregates corrected chunks; the title is taken from the first chunk that has one
+    (generate_title is only called when none has).
     """
     chunks = split_text_into_chunks(raw_text, chunk_size)
     if len(chunks) == 1:
         if log_chunks:
             logger.info(f"Single chunk (len={len(chunks[0])} <= chunk_size={chunk_size}); using single correction call.")
-        return correct_transcript(raw_text, model_name=model_name)
+        return await correct_transcript(raw_text, model_name=model_name)
     if log_chunks:
         logger.info(f"Chunk plan ({len(chunks)} chunks, chunk_size={chunk_size}): {_describe_chunks(chunks)}")
-    logger.info(f"Transcript split into {len(chunks)} chunks (chunk_size={chunk_size}).")
-    corrected_parts: list[str] = []
+    logger.info(f"Transcript split into {len(chunks)} chunks (chunk_size={chunk_size}, max_concurrency={max_concurrency}, rpm={requests_per_minute}).")
     total_before = sum(len(c) for c in chunks)
-    for idx, chunk in enumerate(chunks, start=1):
-        logger.info(f"[Chunk {idx}/{len(chunks)}] chars={len(chunk)}")
-        try:
-            resp = correct_transcript(chunk, model_name=model_name)
-            corrected_parts.append(resp.transcript.strip())
-            if log_chunks:
-                logger.info(f"[Chunk {idx}] corrected_length={len(corrected_parts[-1])}")
-        except Exception as e:  # noqa
-            logger.error(f"Chunk {idx} correction failed: {e}")
-            corrected_parts.append(f"[Chunk {idx} correction failed]\n{chunk}")
-        if per_chunk_sleep > 0 and idx < len(chunks):
-            logger.info(f"Sleeping {per_chunk_sleep}s before next chunk to respect rate limits.")
-            time.sleep(per_chunk_sleep)
-    combined = "\n\n".join(corrected_parts).strip()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    limiter = _make_limiter(requests_per_minute)
+
+    async def _correct_chunk(idx: int, chunk: str) -> tuple[str, str]:
+        async with semaphore, limiter:
+            logger.info(f"[Chunk {idx}/{len(chunks)}] chars={len(chunk)}")
+            try:
+                resp = await correct_transcript(chunk, model_name=model_name)
+            except Exception as e:  # noqa
+                logger.error(f"Chunk {idx} correction failed: {e}")
+                return f"[Chunk {idx} correction failed]\n{chunk}", ""
+        corrected_part = resp.transcript.strip()
+        if log_chunks:
+            logger.info(f"[Chunk {idx}] corrected_length={len(corrected_part)} title={resp.title!r}")
+        return corrected_part, resp.title.strip()
+
+    # gather returns results in chunk order, whatever the completion order
+    results = await asyncio.gather(*[
+        _correct_chunk(idx, chunk) for idx, chunk in enumerate(chunks, start=1)
+    ])
+    combined = "\n\n".join(part for part, _ in results).strip()
     if log_chunks:
         logger.info(f"Total pre-correction chars={total_before}, post-correction chars={len(combined)}")
-    title = generate_title(combined)
+    # The opening chunk usually states the topic; its title saves a model call over the whole transcript
+    title = next((chunk_title for _, chunk_title in results if chunk_title), None)
+    if title is None:
+        title = await generate_title(combined)
+    else:
+        title = title.splitlines()[0][:120]
     return TranscriptResponse(title=title, transcript=combined)
 
 # ----------------- Utility Functions -----------------
 
+_VID_RE = re.compile(r'(?:v=|/)([0-9A-Za-z_-]{11})')
+_VID_CHARS = frozenset("0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_-")
+
+def _video_id_after(url: str, marker: str) -> Optional[str]:
+    i = url.find(marker)
+    if i < 0:
+        return None
+    candidate = url[i + len(marker):i + len(marker) + 11]
+    if len(candidate) == 11 and _VID_CHARS.issuperset(candidate):
+        return candidate
+    return None
+
 def extract_video_id(youtube_url: str) -> Optional[str]:
     """Extract the 11-char YouTube video ID from various URL patterns."""
-    # Try query param 'v'
-    parsed = urlparse(youtube_url)
-    qv = parse_qs(parsed.query).get("v", [])
-    if qv and len(qv[0]) == 11:
-        return qv[0]
-    # Try common path forms
-    candidates = [seg for seg in parsed.path.split('/') if seg]
+    # Common shapes first, with plain str searches: youtu.be/<id> and watch?v=<id>
+    for marker in ("youtu.be/", "?v=", "&v="):
+        vid = _video_id_after(youtube_url, marker)
+        if vid:
+            return vid
+    # Try common path forms (/embed/<id>, /shorts/<id>, ...)
+    candidates = [seg for seg in urlparse(youtube_url).path.split('/') if seg]
     for seg in reversed(candidates):
         if len(seg) == 11:
             return seg
-    # Fallback regex patterns
-    patterns = [r'(?:v=|\/)([0-9A-Za-z_-]{11}).*', r'youtu\.be\/([0-9A-Za-z_-]{11})']
-    for pattern in patterns:
-        m = re.search(pattern, youtube_url)
-        if m:
-            return m.group(1)
-    return None
+    # Fallback regex
+    m = _VID_RE.search(youtube_url)
+    return m.group(1) if m else None
 
 def get_transcript_from_url(youtube_url: str) -> str:
     """Retrieve full transcript text for the video or an error string."""
@@ -199,9 +329,15 @@ def get_transcript_from_url(youtube_url: str) -> str:
     try:
         api = YouTubeTranscriptApi()
         transcript_list = api.fetch(vid)
-        if transcript_list:
-            logger.info(f"Fetched {len(transcript_list)} transcript segments for video {vid}.")
-        return ''.join([item.text for item in transcript_list])
+        # Single pass: write segments into one buffer and count them along the way
+        buffer = io.StringIO()
+        segments = 0
+        for item in transcript_list:
+            buffer.write(item.text)
+            segments += 1
+        if segments:
+            logger.info(f"Fetched {segments} transcript segments for video {vid}.")
+        return buffer.getvalue()
     except TranscriptsDisabled:
         return "Error: Transcripts are disabled for this video."
     except NoTranscriptFound:
@@ -211,10 +347,9 @@ def get_transcript_from_url(youtube_url: str) -> str:
 
 # ----------------- Summary Helpers -----------------
 
-def summarize_transcript(corrected: str, model_name: str = "gemini-2.0-flash") -> str:
+async def summarize_transcript(corrected: str, model_name: str = "gemini-2.0-flash") -> str:
     """Generate a summary for the corrected transcript."""
     logger.info("Initializing model for summary generation...")
-    summary_model = ChatGoogleGenerativeAI(model=model_name, temperature=0.3)
     summary_prompt = f"""You are a technical analyst. Produce a crisp summary for an internal knowledge base about a technology-focused YouTube video.
 Transcript (already cleaned/corrected):
 {corrected}
@@ -235,27 +370,14 @@ Do NOT add any extra explanatory text outside the structure."""
         ("system", "You produce precise hierarchical summaries for technical video transcripts. No verbosity."),
         ("human", summary_prompt),
     ]
-    resp = invoke_with_retry(summary_model, messages)
+    resp = await ainvoke_cached(model_name, 0.3, messages)
     return getattr(resp, "content", str(resp))
 
-def summarize_paragraphs(corrected: str, model_name: str = "gemini-2.0-flash", batch_size: int = 40) -> str:
-    """
-    Batched paragraph summarization to reduce API calls.
-    Splits paragraphs, groups into batches, one model call per batch.
-    """
-    logger.info("Initializing model for batched paragraph summarization...")
-    blocks = [b.strip() for b in re.split(r"\n{2,}", corrected) if b.strip()]
-    if not blocks:
-        return "Paragraph Summaries:\n- (No content)"
-    model = ChatGoogleGenerativeAI(model=model_name, temperature=0)
-    summaries: list[str] = []
-    for start in range(0, len(blocks), batch_size):
-        batch = blocks[start:start+batch_size]
-        first_index = start + 1
-        last_index = start + len(batch)
-        logger.info(f"Summarizing paragraphs {first_index}-{last_index} / {len(blocks)} (1 request)...")
-        numbered = "\n\n".join([f"[P{first_index+i}] {para}" for i, para in enumerate(batch)])
-        prompt = f"""You will receive several transcript paragraphs each tagged like [P<number>].
+async def _summarize_paragraph_batch(model_name: str, batch: list[str], first_index: int, total: int, semaphore: asyncio.Semaphore, limiter: AsyncLimiter) -> list[str]:
+    """Summarize one batch of paragraphs (one model call) into bullet lines."""
+    last_index = first_index + len(batch) - 1
+    numbered = "\n\n".join(f"[P{n}] {para}" for n, para in zip(itertools.count(first_index), batch))
+    prompt = f"""You will receive several transcript paragraphs each tagged like [P<number>].
 For EACH paragraph return exactly one bullet line:
 - P<number>: summary (<=25 words)
 Keep order. No extra text. ONLY those bullet lines.
@@ -263,12 +385,15 @@ Keep order. No extra text. ONLY those bullet lines.
 Paragraphs:
 {numbered}
 """
-        messages = [
-            ("system", "You distill multiple transcript paragraphs into ultra-terse bullet summaries (<=25 words each)."),
-            ("human", prompt),
-        ]
+    messages = [
+        ("system", "You distill multiple transcript paragraphs into ultra-terse bullet summaries (<=25 words each)."),
+        ("human", prompt),
+    ]
+    summaries: list[str] = []
+    async with semaphore, limiter:
+        logger.info(f"Summarizing paragraphs {first_index}-{last_index} / {total} (1 request)...")
         try:
-            resp = invoke_with_retry(model, messages)
+            resp = await ainvoke_cached(model_name, 0, messages)
             content = getattr(resp, "content", str(resp)).strip()
             for line in content.splitlines():
                 line = line.strip()
@@ -281,11 +406,38 @@ Paragraphs:
             logger.error(f"Batch {first_index}-{last_index} summarization failed: {e}")
             for i in range(first_index, last_index + 1):
                 summaries.append(f"- P{i}: (summary failed)")
+    return summaries
+
+async def summarize_paragraphs(
+    corrected: str,
+    model_name: str = "gemini-2.0-flash",
+    batch_size: int = 40,
+    max_concurrency: int = 8,
+    requests_per_minute: float = 15
+) -> str:
+    """
+    Batched paragraph summarization to reduce API calls.
+    Splits paragraphs, groups into batches, one model call per batch.
+    Batches are independent: up to max_concurrency of them are in flight at once,
+    paced to requests_per_minute to avoid 429s. A failed batch yields "(summary failed)" lines.
+    """
+    logger.info("Initializing model for batched paragraph summarization...")
+    blocks = _split_paragraphs(corrected)
+    if not blocks:
+        return "Paragraph Summaries:\n- (No content)"
+    semaphore = asyncio.Semaphore(max_concurrency)
+    limiter = _make_limiter(requests_per_minute)
+    # gather keeps results in batch order, so paragraph numbering stays monotonic
+    results = await asyncio.gather(*[
+        _summarize_paragraph_batch(model_name, blocks[start:start+batch_size], start + 1, len(blocks), semaphore, limiter)
+        for start in range(0, len(blocks), batch_size)
+    ])
+    summaries = [line for batch_summaries in results for line in batch_summaries]
     return "Paragraph Summaries:\n" + "\n".join(summaries)
 
 # ----------------- Main Workflow -----------------
 
-def process_video(
+async def process_video(
     url: str,
     force: bool = False,
     base_dir: str = "data/transcripts",
@@ -294,7 +446,9 @@ def process_video(
     disable_paragraph_summaries: bool = False,
     disable_summary: bool = False,
     paragraph_batch_size: int = 40,
-    per_chunk_sleep: float = 5.0,
+    paragraph_concurrency: int = 8,
+    correction_concurrency: int = 4,
+    requests_per_minute: float = 15,
     log_chunks: bool = True
 ):
     vid = extract_video_id(url)
@@ -310,79 +464,97 @@ def process_video(
     summary_path = os.path.join(video_dir, "summary.md")
     paragraph_summary_path = os.path.join(video_dir, "paragraph_summaries.md")
 
-    logger.info(f"Config: chunk_size={chunk_size}, per_chunk_sleep={per_chunk_sleep}s, model={model_name}")
+    logger.info(f"Config: chunk_size={chunk_size}, correction_concurrency={correction_concurrency}, rpm={requests_per_minute}, model={model_name}")
+
+    # The raw transcript is only needed when the correction step has to run
+    correction_cached = not force and os.path.isfile(corrected_path) and title_txt_in_dir(video_dir)
 
     # Step 1: Fetch transcript (skip if exists unless force)
     if not force and os.path.isfile(original_path):
-        logger.info(f"Skipping transcript fetch; exists: {original_path}")
-        with open(original_path, "r", encoding="utf-8") as f:
-            transcript = f.read()
+        if correction_cached:
+            logger.info(f"Skipping transcript fetch and read; exists: {original_path}")
+            transcript = None
+        else:
+            logger.info(f"Skipping transcript fetch; exists: {original_path}")
+            async with aiofiles.open(original_path, "r", encoding="utf-8") as f:
+                transcript = await f.read()
     else:
         logger.info("Fetching transcript from YouTube API...")
         transcript = get_transcript_from_url(url)
         if transcript.startswith("Error:"):
             logger.error(transcript)
             return
-        with open(original_path, "w", encoding="utf-8") as f:
-            f.write(transcript)
+        async with aiofiles.open(original_path, "w", encoding="utf-8") as f:
+            await f.write(transcript)
         logger.info(f"Transcript saved to {original_path}")
 
     # Step 2: Correct transcript (chunk-aware)
-    if not force and os.path.isfile(corrected_path) and title_txt_in_dir(video_dir):
+    if correction_cached:
         logger.info(f"Skipping correction; exists: {corrected_path}")
-        with open(corrected_path, "r", encoding="utf-8") as f:
-            corrected = f.read()
+        async with aiofiles.open(corrected_path, "r", encoding="utf-8") as f:
+            corrected = await f.read()
     else:
         logger.info("Correcting transcript with LLM (chunked if large)...")
-        correction = correct_transcript_chunked(
+        correction = await correct_transcript_chunked(
             transcript,
             chunk_size=chunk_size,
             model_name=model_name,
-            per_chunk_sleep=per_chunk_sleep,
+            max_concurrency=correction_concurrency,
+            requests_per_minute=requests_per_minute,
             log_chunks=log_chunks
         )
         corrected = correction.transcript
-        with open(corrected_path, "w", encoding="utf-8") as f:
-            f.write(corrected)
+        async with aiofiles.open(corrected_path, "w", encoding="utf-8") as f:
+            await f.write(corrected)
         logger.info(f"Corrected transcript saved to {corrected_path}")
 
         logger.info("Saving title...")
         safe_title = correction.title.replace(' ', '_')
         title_file_path = os.path.join(video_dir, f"title_{safe_title}.txt")
-        with open(title_file_path, "w", encoding="utf-8") as f:
-            f.write(correction.title)
+        async with aiofiles.open(title_file_path, "w", encoding="utf-8") as f:
+            await f.write(correction.title)
 
     # Step 2.5: Paragraph-level summaries (skip if exists unless force)
-    if disable_paragraph_summaries:
-        logger.info("Paragraph summarization disabled by flag.")
-    else:
-        if not force and os.path.isfile(paragraph_summary_path):
+    async def _write_paragraph_summaries():
+        if disable_paragraph_summaries:
+            logger.info("Paragraph summarization disabled by flag.")
+        elif not force and os.path.isfile(paragraph_summary_path):
             logger.info(f"Skipping paragraph summaries; exists: {paragraph_summary_path}")
         else:
             logger.info("Generating paragraph-level summaries (batched)...")
             try:
-                para_summaries = summarize_paragraphs(corrected, model_name=model_name, batch_size=paragraph_batch_size)
-                with open(paragraph_summary_path, "w", encoding="utf-8") as f:
-                    f.write(para_summaries)
+                para_summaries = await summarize_paragraphs(
+                    corrected,
+                    model_name=model_name,
+                    batch_size=paragraph_batch_size,
+                    max_concurrency=paragraph_concurrency,
+                    requests_per_minute=requests_per_minute
+                )
+                async with aiofiles.open(paragraph_summary_path, "w", encoding="utf-8") as f:
+                    await f.write(para_summaries)
                 logger.info(f"Paragraph summaries saved to {paragraph_summary_path}")
             except Exception as e:  # noqa
                 logger.error(f"Failed to generate paragraph summaries: {e}")
+
     # Step 3: Summarize (skip if exists unless force)
-    if disable_summary:
-        logger.info("High-level summary generation disabled by flag.")
-    else:
-        if not force and os.path.isfile(summary_path):
+    async def _write_summary():
+        if disable_summary:
+            logger.info("High-level summary generation disabled by flag.")
+        elif not force and os.path.isfile(summary_path):
             logger.info(f"Skipping summary; exists: {summary_path}")
         else:
             logger.info("Generating summary with LLM...")
             try:
-                summary_text = summarize_transcript(corrected, model_name=model_name)
-                with open(summary_path, "w", encoding="utf-8") as f:
-                    f.write(summary_text)
+                summary_text = await summarize_transcript(corrected, model_name=model_name)
+                async with aiofiles.open(summary_path, "w", encoding="utf-8") as f:
+                    await f.write(summary_text)
                 logger.info(f"Summary saved to {summary_path}")
             except Exception as e:  # noqa
                 logger.error(f"Failed to generate summary: {e}")
 
+    # Steps 2.5 and 3 only depend on the corrected transcript and write separate files: run them concurrently
+    await asyncio.gather(_write_paragraph_summaries(), _write_summary())
+
     logger.info("Processing complete.")
 
 
@@ -394,8 +566,9 @@ def title_txt_in_dir(video_dir: str | Path) -> bool:
     if not video_path.is_dir():
         raise NotADirectoryError(f"{video_dir} is not a directory")
 
-    # Look for any file matching the pattern title_*.txt
-    return any(video_path.glob("title_*.txt"))
+    # Look for any file matching the pattern title_*.txt (plain prefix/suffix test; is_file uses the cached dirent type)
+    with os.scandir(video_path) as entries:
+        return any(e.name.startswith("title_") and e.name.endswith(".txt") and e.is_file() for e in entries)
 
 
 # ----------------- CLI Entry -----------------
@@ -410,15 +583,22 @@ def build_arg_parser():
     p.add_argument("--disable-paragraph-summaries", action="store_true", help="Skip paragraph summaries to save quota")
     p.add_argument("--disable-summary", action="store_true", help="Skip global summary to save quota")
     p.add_argument("--paragraph-batch-size", type=int, default=40, help="Paragraphs per summarization batch (default: 40)")
-    p.add_argument("--per-chunk-sleep", type=float, default=2.0,
-                   help="Sleep seconds between chunk corrections (rate limit help, default: 2.0)")
+    p.add_argument("--paragraph-concurrency", type=int, default=8, help="Max paragraph batches summarized concurrently (default: 8)")
+    p.add_argument("--correction-concurrency", type=int, default=4, help="Max chunks corrected concurrently (default: 4)")
+    p.add_argument("--requests-per-minute", type=float, default=15,
+                   help="Pace chunk corrections, and separately paragraph-summary batches, to this many requests per minute each (default: 15)")
+    p.add_argument("--no-cache", action="store_true", help="Always call the model, bypassing the local response cache")
     p.add_argument("--log-chunks", action="store_true", default=True, help="Verbose logging of chunk sizes and lengths (default: enabled)")
     return p
 
 if __name__ == "__main__":
     parser = build_arg_parser()
     args = parser.parse_args()
-    process_video(
+    if args.requests_per_minute <= 0:
+        parser.error("--requests-per-minute must be positive")
+    if args.no_cache:
+        use_llm_cache = False
+    asyncio.run(process_video(
         args.url,
         force=args.force,
         base_dir=args.base_dir,
@@ -427,6 +607,8 @@ if __name__ == "__main__":
         disable_paragraph_summaries=args.disable_paragraph_summaries,
         disable_summary=args.disable_summary,
         paragraph_batch_size=args.paragraph_batch_size,
-        per_chunk_sleep=args.per_chunk_sleep,
+        paragraph_concurrency=args.paragraph_concurrency,
+        correction_concurrency=args.correction_concurrency,
+        requests_per_minute=args.requests_per_minute,
         log_chunks=args.log_chunks
-    )
\ No newline at end of file
+    ))
\ No newline at end of file
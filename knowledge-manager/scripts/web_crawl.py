@@ -1,5 +1,6 @@
 
 import argparse
+import asyncio
 import logging
 from pathlib import Path
 import csv
@@ -23,9 +24,9 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def main(start_url: str, crawl: bool = False, summarize: bool | None = None):
-    crawler = WebCrawlerAgent()
-    result = crawler.fetch(start_url=start_url, crawl=crawl)
+def main(start_url: str, crawl: bool = False, summarize: bool | None = None, use_cache: bool = True):
+    crawler = WebCrawlerAgent(use_cache=use_cache)
+    result = asyncio.run(crawler.fetch(start_url=start_url, crawl=crawl))
     run_dir: Path = result["run_dir"]
 
     if summarize is None:
@@ -33,7 +34,7 @@ def main(start_url: str, crawl: bool = False, summarize: bool | None = None):
         summarize = resp == 'y'
 
     if summarize:
-        summarizer = SummarizerAgent()
+        summarizer = SummarizerAgent(use_cache=use_cache)
         summaries_dir = run_dir / "summaries"
         combined_path = summarizer.summarize(result["pages"], summaries_dir)
         # Also write a plain summary.txt with combined content
@@ -46,11 +47,11 @@ def main(start_url: str, crawl: bool = False, summarize: bool | None = None):
     logger.info(f"Artifacts available in: {run_dir}")
 
 
-def process_csv(csv_path: Path, summarize: Optional[bool]):
-    """Batch mode: fetch ALL entries first, then optionally summarize ALL."""
+def process_csv(csv_path: Path, summarize: Optional[bool], max_workers: int = 4, use_cache: bool = True):
+    """Batch mode: fetch ALL entries first (up to max_workers concurrently), then optionally summarize ALL."""
     if not csv_path.exists():
         raise FileNotFoundError(f"CSV file not found: {csv_path}")
-    crawler = WebCrawlerAgent()
+    crawler = WebCrawlerAgent(use_cache=use_cache)
     rows: list[tuple[str, bool]] = []
     with csv_path.open("r", encoding="utf-8") as f:
         reader = csv.reader(f, delimiter=';')
@@ -65,13 +66,21 @@ def process_csv(csv_path: Path, summarize: Optional[bool]):
                 crawl_flag = val in {"true", "1", "yes", "y"}
             rows.append((url, crawl_flag))
 
-    logger.info(f"[CSV] Loaded {len(rows)} entries. Starting fetch phase...")
-    run_results: list[dict] = []
-    for url, crawl_flag in rows:
-        logger.info(f"[CSV][FETCH] URL={url} crawl={crawl_flag}")
-        result = crawler.fetch(start_url=url, crawl=crawl_flag)
-        run_results.append(result)
-        logger.info(f"[CSV][FETCH] Done: {result['run_dir']}")
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def _fetch_row(url: str, crawl_flag: bool) -> dict:
+        async with semaphore:
+            logger.info(f"[CSV][FETCH] URL={url} crawl={crawl_flag}")
+            result = await crawler.fetch(start_url=url, crawl=crawl_flag)
+            logger.info(f"[CSV][FETCH] Done: {result['run_dir']}")
+            return result
+
+    async def _fetch_all() -> list[dict]:
+        # Fetching is network-bound: overlap the rows; gather keeps results in CSV order
+        return await asyncio.gather(*[_fetch_row(url, crawl_flag) for url, crawl_flag in rows])
+
+    logger.info(f"[CSV] Loaded {len(rows)} entries. Starting fetch phase (max_workers={max_workers})...")
+    run_results: list[dict] = asyncio.run(_fetch_all())
 
     # Decide summarization once for all runs
     do_summary = summarize
@@ -83,7 +92,7 @@ def process_csv(csv_path: Path, summarize: Optional[bool]):
         logger.info("Batch summarization skipped.")
         return
 
-    summarizer = SummarizerAgent()
+    summarizer = SummarizerAgent(use_cache=use_cache)
     logger.info("Starting batch summarization phase...")
     for result in run_results:
         run_dir: Path = result['run_dir']
@@ -102,6 +111,8 @@ if __name__ == "__main__":
     parser.add_argument("--crawl", action="store_true", help="Automatically crawl pagination using an LLM.")
     parser.add_argument("--no-summary", action="store_true", help="Skip summarization without prompting.")
     parser.add_argument("--summary", action="store_true", help="Force summarization without prompting.")
+    parser.add_argument("--no-cache", action="store_true", help="Always call the model, bypassing the local response cache.")
+    parser.add_argument("--workers", type=int, default=4, help="Max CSV rows fetched concurrently (default: 4)")
     args = parser.parse_args()
 
     summarize_flag = None
@@ -111,6 +122,6 @@ if __name__ == "__main__":
         summarize_flag = True
 
     if args.csv:
-        process_csv(Path(args.csv), summarize_flag)
+        process_csv(Path(args.csv), summarize_flag, max_workers=args.workers, use_cache=not args.no_cache)
     else:
-        main(args.url, crawl=args.crawl, summarize=summarize_flag)
\ No newline at end of file
+        main(args.url, crawl=args.crawl, summarize=summarize_flag, use_cache=not args.no_cache)
\ No newline at end of file
@@ -1,60 +1,153 @@
-import json
+import asyncio
+import gzip
+import xml.etree.ElementTree as ET
 import feedparser
-from typing import List, Dict, Any
+import httpx
+import ijson
+import orjson
+from typing import List, Dict, Any, Iterator, Optional
 from datetime import datetime
 from .base_crawler import BaseCrawler
 
+ARXIV_API_URL = "http://export.arxiv.org/api/query"
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+
+
+def _text(element: ET.Element, tag: str) -> str:
+    child = element.find(ATOM_NS + tag)
+    # Stripped like feedparser's values: arXiv wraps titles and summaries in whitespace
+    return (child.text or "").strip() if child is not None else ""
+
+
+def _last_author(element: ET.Element) -> str:
+    """Last listed author, the one feedparser reports as entry.author."""
+    names = element.findall(f"{ATOM_NS}author/{ATOM_NS}name")
+    return (names[-1].text or "").strip() if names else ""
+
+
+def _entry_link(element: ET.Element) -> str:
+    links = element.findall(ATOM_NS + "link")
+    for link in links:
+        if link.get("rel", "alternate") == "alternate":
+            return link.get("href", "")
+    return links[0].get("href", "") if links else ""
+
+
+def _open_store(filepath: str, mode: str):
+    """Opens a store file in binary mode, gzip-compressed when the name ends with .gz."""
+    return gzip.open(filepath, mode) if filepath.endswith(".gz") else open(filepath, mode)
+
 
 class ArxivCrawler(BaseCrawler):
     def __init__(self, limit: int = 10):
         self.limit = limit
 
-    def fetch(self, query: str, limit: int = None) -> List[Dict[str, Any]]:
-        """Fetches arxiv entries based on a query."""
+    def _make_entry(self, query: str, **fields) -> Dict[str, Any]:
+        return {
+            "crawler_name": "ArxivCrawler",
+            "query": query,
+            "fetched_at": datetime.now().isoformat(),
+            **fields,
+        }
+
+    def _parse_atom(self, content: bytes, query: str) -> List[Dict[str, Any]]:
+        """Parses the arxiv Atom response with ElementTree (raises ET.ParseError on malformed XML)."""
+        root = ET.fromstring(content)
+        return [
+            self._make_entry(
+                query,
+                title=_text(entry, "title"),
+                link=_entry_link(entry),
+                published=_text(entry, "published"),
+                updated=_text(entry, "updated"),
+                summary=_text(entry, "summary"),
+                author=_last_author(entry),
+                category=[tag.get("term", "") for tag in entry.findall(ATOM_NS + "category")],
+            )
+            for entry in root.iter(ATOM_NS + "entry")
+        ]
+
+    def _parse_feedparser(self, content: bytes, query: str) -> List[Dict[str, Any]]:
+        """Lenient fallback for responses ElementTree cannot parse."""
+        feed = feedparser.parse(content)
+        if feed.bozo:
+            print("Error fetching arxiv feed.")
+            return []
+        return [
+            self._make_entry(
+                query,
+                title=entry.title,
+                link=entry.link,
+                published=entry.get("published", ""),
+                updated=entry.get("updated", ""),
+                summary=entry.get("summary", ""),
+                author=entry.get("author", ""),
+                category=[tag['term'] for tag in entry.get('tags', [])] if 'tags' in entry else [],
+            )
+            for entry in feed.entries
+        ]
+
+    async def afetch(self, query: str, limit: int = None, client: Optional[httpx.AsyncClient] = None) -> List[Dict[str, Any]]:
+        """Fetches arxiv entries based on a query, reusing client's connections when given."""
         if limit is None:
             limit = self.limit
         print(f"Fetching arxiv with query={query}...")
-        feed = feedparser.parse(
-            f'http://export.arxiv.org/api/query?search_query={query}&max_results={limit}&sortBy=lastUpdatedDate&sortOrder=descending'
-        )
+        params = {
+            "search_query": query,
+            "max_results": limit,
+            "sortBy": "lastUpdatedDate",
+            "sortOrder": "descending",
+        }
+        try:
+            if client is None:
+                async with httpx.AsyncClient(timeout=30) as own_client:
+                    response = await own_client.get(ARXIV_API_URL, params=params)
+            else:
+                response = await client.get(ARXIV_API_URL, params=params)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            print(f"Error fetching arxiv feed: {e}")
+            return []
 
-        if feed.bozo:
-            print("Error fetching arxiv feed.")
-            entries = []
-        else:
-            print(f"Fetched {len(feed.entries)} entries.")
-            entries = [
-                {
-                    "crawler_name": "ArxivCrawler",
-                    "query": query,
-                    "fetched_at": datetime.now().isoformat(),
-                    "title": entry.title,
-                    "link": entry.link,
-                    "published": entry.get("published", ""),
-                    "updated": entry.get("updated", ""),
-                    "summary": entry.get("summary", ""),
-                    "author": entry.get("author", ""),
-                    "category": [tag['term'] for tag in entry.get('tags', [])] if 'tags' in entry else [],
-                }
-                for entry in feed.entries
-            ]
+        try:
+            entries = self._parse_atom(response.content, query)
+        except ET.ParseError:
+            entries = self._parse_feedparser(response.content, query)
+        print(f"Fetched {len(entries)} entries.")
         return entries
 
-    def save(self, data: List[Dict[str, Any]], output_filepath: str) -> None:
-        with open(output_filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+    def fetch(self, query: str, limit: int = None) -> List[Dict[str, Any]]:
+        """Fetches arxiv entries based on a query."""
+        return asyncio.run(self.afetch(query, limit))
+
+    def save(self, data: List[Dict[str, Any]], output_filepath: str, pretty: bool = False) -> None:
+        """Writes compact UTF-8 JSON (indented only with pretty=True, gzip if the path ends with .gz)."""
+        with _open_store(output_filepath, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0))
         print(f"Data saved to {output_filepath}")
 
-    def load(self, input_filepath: str) -> List[Dict[str, Any]]:
+    def iter_load(self, input_filepath: str) -> Iterator[Dict[str, Any]]:
+        """
+        Yields saved entries one by one as the file is parsed, so filtering callers never hold the whole archive.
+        Yields nothing if the file does not exist.
+        """
         try:
-            with open(input_filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            f = _open_store(input_filepath, "rb")
         except FileNotFoundError:
             print(f"File {input_filepath} not found.")
-            data = []
-        return data
+            return
+        with f:
+            yield from ijson.items(f, "item")
 
-    def run(self):
-        for query in ["llm", "agents", "RAG"]:
-            entries = self.fetch(query=query)
+    def load(self, input_filepath: str) -> List[Dict[str, Any]]:
+        return list(self.iter_load(input_filepath))
+
+    async def _arun(self, queries: List[str]):
+        # One client for all queries: keep-alive connection reused, requests in flight together
+        async with httpx.AsyncClient(timeout=30) as client:
+            results = await asyncio.gather(*[self.afetch(query=query, client=client) for query in queries])
+        for query, entries in zip(queries, results):
             self.save(entries, f"store/arxiv_{query}.json")
+
+    def run(self):
+        asyncio.run(self._arun(["llm", "agents", "RAG"]))
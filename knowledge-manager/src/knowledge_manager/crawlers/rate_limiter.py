@@ -0,0 +1,13 @@
+import functools
+
+from langchain_core.rate_limiters import InMemoryRateLimiter
+
+
+@functools.lru_cache(maxsize=None)
+def shared_rate_limiter(model_name: str, requests_per_second: float) -> InMemoryRateLimiter:
+    """Token bucket per (model, rate): every agent calling the same model draws from the same quota."""
+    return InMemoryRateLimiter(
+        requests_per_second=requests_per_second,
+        check_every_n_seconds=0.1,
+        max_bucket_size=1,
+    )
@@ -1,12 +1,33 @@
+import atexit
 import feedparser
-import json
-from typing import List, Dict, Any
+import httpx
+import orjson
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
+from lxml import etree
+from lxml import html as lxml_html
 from .base_crawler import BaseCrawler
 
 
+# One keep-alive connection pool for every feed fetch (httpx.Client is safe to share between threads)
+_http = httpx.Client(timeout=15.0, follow_redirects=True, headers={"User-Agent": "alfred2-rss/1.0"})
+atexit.register(_http.close)
+
+
+def _summary_text(summary: str) -> str:
+    """Plain text of an HTML feed summary (raw summary back if it cannot be parsed)."""
+    if not summary or not summary.strip():
+        return ""
+    try:
+        return lxml_html.fromstring(summary).text_content().strip()
+    except (etree.ParserError, ValueError):
+        return summary
+
+
 class RSSCrawler(BaseCrawler):
-    def __init__(self, rss_feeds: List[str] = None, limit: int = 5):
+    def __init__(self, rss_feeds: List[str] = None, limit: int = 5, state_filepath: Optional[str] = None):
         self.rss_feeds = rss_feeds or [
             "https://eugeneyan.com/rss/",
             "https://www.philschmid.de/rss",
@@ -16,56 +37,120 @@ class RSSCrawler(BaseCrawler):
             "https://blog.python.org/feeds/posts/default?alt=rss",
         ]
         self.limit = limit
+        # Per-feed etag / last-modified / links already returned; None (default) disables conditional fetching
+        self.state_filepath = state_filepath
+        # State from the last fetch, written by commit_state once its articles are safely stored
+        self._pending_state: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _load_state(self) -> Dict[str, Dict[str, Any]]:
+        if not self.state_filepath or not os.path.isfile(self.state_filepath):
+            return {}
+        try:
+            with open(self.state_filepath, "rb") as f:
+                return orjson.loads(f.read())
+        except Exception as e:
+            print(f"Ignoring unreadable RSS state {self.state_filepath}: {e}")
+            return {}
+
+    def _save_state(self, state: Dict[str, Dict[str, Any]]) -> None:
+        if not self.state_filepath:
+            return
+        os.makedirs(os.path.dirname(self.state_filepath) or ".", exist_ok=True)
+        with open(self.state_filepath, "wb") as f:
+            f.write(orjson.dumps(state))
+
+    def _fetch_one(self, rss_feed: str, limit: int, feed_state: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Fetches one feed with a conditional GET; returns (new articles, updated feed state).
+        Returns no articles on error or 304. Logs are printed as one block so feeds don't interleave.
+        """
+        logs = ["---------------", f"Fetching articles from {rss_feed}..."]
+        articles = []
+        try:
+            conditional_headers = {}
+            if feed_state.get("etag"):
+                conditional_headers["If-None-Match"] = feed_state["etag"]
+            if feed_state.get("modified"):
+                conditional_headers["If-Modified-Since"] = feed_state["modified"]
+            response = _http.get(rss_feed, headers=conditional_headers)
+            if response.status_code == 304:
+                logs.append("Feed not modified since last fetch.")
+                print("\n".join(logs))
+                return [], feed_state
+            response.raise_for_status()
+            feed = feedparser.parse(response.content, response_headers=dict(response.headers))
+            logs.append(f"Fetched {len(feed.entries)} entries.")
+
+            # Extract articles not returned by a previous run
+            seen_links = set(feed_state.get("seen_links", []))
+            articles = [
+                {
+                    "crawler_name": "RSSCrawler",
+                    "rss_feed": rss_feed,
+                    "fetched_at": datetime.now().isoformat(),
+                    "title": entry.title,
+                    "link": entry.link,
+                    "summary": _summary_text(entry.get("summary", "")),
+                }
+                for entry in feed.entries
+                if entry.get("link") not in seen_links
+            ][:limit]
+
+            if not articles:
+                logs.append(f"No new articles found in the RSS feed: {rss_feed}")
+
+            # Only remember links still in the feed, so the state stays as small as the feed itself
+            feed_links = {entry.get("link") for entry in feed.entries}
+            feed_state = {
+                "etag": response.headers.get("etag"),
+                "modified": response.headers.get("last-modified"),
+                "seen_links": sorted((seen_links & feed_links) | {article["link"] for article in articles}),
+            }
+
+        except Exception as e:
+            logs.append(f"An error occurred while fetching the RSS feed from {rss_feed}: {e}")
+            articles = []
+        print("\n".join(logs))
+        return articles, feed_state
 
     def fetch(self, rss_feeds: List[str] = None, limit: int = None) -> List[Dict[str, Any]]:
         feeds = rss_feeds or self.rss_feeds
         limit = limit if limit is not None else self.limit
-        all_articles = []
-
-        for rss_feed in feeds:
-            print("---------------")
-            print(f"Fetching articles from {rss_feed}...")
-            try:
-                feed = feedparser.parse(rss_feed)
-                print(f"Fetched {len(feed.entries)} entries.")
-
-                # Extract articles
-                articles = [
-                    {
-                        "crawler_name": "RSSCrawler",
-                        "rss_feed": rss_feed,
-                        "fetched_at": datetime.now().isoformat(),
-                        "title": entry.title,
-                        "link": entry.link,
-                        "summary": entry.get("summary", ""),
-                    }
-                    for entry in feed.entries[:limit]
-                ]
-
-                if not articles:
-                    print(f"No articles found in the RSS feed: {rss_feed}")
-                else:
-                    all_articles.extend(articles)
-
-            except Exception as e:
-                print(f"An error occurred while fetching the RSS feed from {rss_feed}: {e}")
+        state = self._load_state()
+
+        # Feeds are independent and network-bound: download them concurrently, map keeps feed order
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(feeds)))) as executor:
+            results = list(executor.map(lambda rss_feed: self._fetch_one(rss_feed, limit, state.get(rss_feed, {})), feeds))
+        all_articles = [article for articles, _ in results for article in articles]
+        for rss_feed, (_, feed_state) in zip(feeds, results):
+            state[rss_feed] = feed_state
+        self._pending_state = state
 
         if not all_articles:
             print("No articles were fetched from any of the provided RSS feeds.")
         return all_articles
 
-    def save(self, data: List[Dict[str, Any]], output_filepath: str) -> None:
+    def commit_state(self) -> None:
+        """Marks the articles of the last fetch as seen. Call it only after they have been saved."""
+        if self._pending_state is not None:
+            self._save_state(self._pending_state)
+            self._pending_state = None
+
+    def save(self, data: List[Dict[str, Any]], output_filepath: str) -> bool:
+        """Returns True if the data was written."""
         try:
-            with open(output_filepath, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
+            with open(output_filepath, "wb") as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
             print(f"Data saved to {output_filepath}")
+            return True
         except Exception as e:
             print(f"An error occurred while saving data to {output_filepath}: {e}")
+            return False
 
     def load(self, input_filepath: str) -> List[Dict[str, Any]]:
         try:
-            with open(input_filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            with open(input_filepath, "rb") as f:
+                data = orjson.loads(f.read())
             return data
         except FileNotFoundError:
             print(f"File {input_filepath} not found.")
@@ -74,10 +159,26 @@ class RSSCrawler(BaseCrawler):
             print(f"An error occurred while loading data from {input_filepath}: {e}")
             return []
 
-    def run(self):
+    def run(self, output_filepath: str = "store/agent_articles.json", state_filepath: Optional[str] = None):
+        """
+        Fetches the feeds and saves the articles to output_filepath.
+        With state_filepath (here or in __init__), only new articles are fetched and they are merged into
+        the existing store; without it the store is replaced by the latest snapshot.
+        """
+        if state_filepath is not None:
+            self.state_filepath = state_filepath
         articles = self.fetch()
         if articles:
-            self.save(articles, "store/agent_articles.json")
+            if self.state_filepath:
+                # fetch() skipped the articles stored by earlier runs: keep them (new articles first)
+                new_links = {article["link"] for article in articles}
+                stored = self.load(output_filepath) if os.path.isfile(output_filepath) else []
+                articles_to_save = articles + [article for article in stored if article.get("link") not in new_links]
+            else:
+                articles_to_save = articles
+            if not self.save(articles_to_save, output_filepath):
+                return
+            self.commit_state()
             for article in articles[: self.limit]:
                 print(f"Title: {article['title']}")
                 print(f"Link: {article['link']}")
@@ -85,4 +186,5 @@ class RSSCrawler(BaseCrawler):
                 print(f"RSS Feed: {article['rss_feed']}")
                 print()
         else:
+            self.commit_state()
             print("No articles to display.")
@@ -1,11 +1,13 @@
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from time import sleep
 from typing import List
 
 from langchain_google_genai import ChatGoogleGenerativeAI
 from pydantic import BaseModel, Field
+from knowledge_manager.llm_cache import LLMCache, content_hash
 from .prompts import SUMMARIZATION_PROMPT
+from .rate_limiter import shared_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -19,35 +21,81 @@ class Summary(BaseModel):
 class SummarizerAgent:
     """Agent to summarize fetched pages and persist per-page & combined summaries."""
 
-    def __init__(self, model_name: str = "gemini-2.5-pro", delay_seconds: int = 5):
+    def __init__(self, model_name: str = "gemini-2.5-pro", delay_seconds: float = 5, max_concurrency: int = 4, use_cache: bool = True):
         self.model_name = model_name
         self.delay_seconds = delay_seconds
-        self.model = ChatGoogleGenerativeAI(model=model_name, temperature=0).with_structured_output(Summary)
+        self.max_concurrency = max_concurrency
+        # Token bucket: requests start at most every delay_seconds, without idling after the last one.
+        # 429s are retried by the client itself (exponential backoff, honoring the server's retry delay).
+        # delay_seconds <= 0 turns pacing off.
+        self.rate_limiter = shared_rate_limiter(model_name, 1 / delay_seconds) if delay_seconds > 0 else None
+        self.model = ChatGoogleGenerativeAI(
+            model=model_name, temperature=0, rate_limiter=self.rate_limiter
+        ).with_structured_output(Summary)
+        # temperature=0: an unchanged page gets the same summary, so it is only requested once
+        self.llm_cache = LLMCache() if use_cache else None
+        # Per-page files are written in the background while the next ones are prepared
+        self._io_pool = ThreadPoolExecutor(max_workers=4)
 
     def summarize(self, pages: List[str], summary_dir: Path) -> Path:
         summary_dir.mkdir(parents=True, exist_ok=True)
-        summaries = []
-        for idx, page in enumerate(pages, start=1):
-            prompt = f"Summarize the following web page (page {idx} of {len(pages)}):\n{page}"
-            messages = [
+        all_messages = [
+            [
                 ("system", SUMMARIZATION_PROMPT),
-                ("human", prompt),
+                ("human", f"Summarize the following web page (page {idx} of {len(pages)}):\n{page}"),
             ]
-            try:
-                result = self.model.invoke(messages)
-                summary_text = result.summary
-            except Exception as e:  # noqa
-                logger.error(f"Summary generation failed for page {idx}: {e}")
-                summary_text = f"(Error summarizing page {idx}: {e})"
-            summaries.append(summary_text)
-            per_page_path = summary_dir / f"page_{idx}_summary.md"
-            per_page_path.write_text(summary_text, encoding="utf-8")
-            logger.info(f"Saved summary for page {idx} to {per_page_path}")
-            logger.info(f"Waiting {self.delay_seconds} seconds before next summary to avoid rate limits...")
-            sleep(self.delay_seconds)
-
-        combined = "\n\n".join([f"# Page {i+1} Summary\n{txt}" for i, txt in enumerate(summaries)])
+            for idx, page in enumerate(pages, start=1)
+        ]
+        # Keyed on the normalized page content (not its position in the crawl):
+        # identical pages are summarized once, in this run and across runs
+        keys = [
+            LLMCache.cache_key(self.model_name, [SUMMARIZATION_PROMPT, content_hash(page)], 0, Summary.__name__)
+            for page in pages
+        ]
+        results = [
+            self.llm_cache.get_structured(key, Summary) if self.llm_cache is not None else None
+            for key in keys
+        ]
+        # First page index for each distinct uncached key
+        missing: dict[str, int] = {}
+        for i, (key, result) in enumerate(zip(keys, results)):
+            if result is None:
+                missing.setdefault(key, i)
+        logger.info(
+            f"Summarizing {len(missing)} distinct of {len(pages)} pages "
+            f"({sum(r is not None for r in results)} cached, max_concurrency={self.max_concurrency})..."
+        )
+        if missing:
+            fresh = self.model.batch(
+                [all_messages[i] for i in missing.values()],
+                config={"max_concurrency": self.max_concurrency},
+                return_exceptions=True,
+            )
+            fresh_by_key = dict(zip(missing, fresh))
+            for key, result in fresh_by_key.items():
+                if self.llm_cache is not None and isinstance(result, Summary):
+                    self.llm_cache.set_structured(key, result)
+            results = [fresh_by_key.get(key, result) if result is None else result for key, result in zip(keys, results)]
+
+        write_futures: List[Future] = []
         combined_path = summary_dir / "combined_summary.md"
-        combined_path.write_text(combined, encoding="utf-8")
+        # The combined file grows as pages are processed: no full-text join held in memory
+        with combined_path.open("w", encoding="utf-8") as combined_f:
+            for idx, result in enumerate(results, start=1):
+                if result is None or isinstance(result, Exception):
+                    # None: the model answered without calling the Summary tool (e.g. a blocked response)
+                    error = result if result is not None else "no structured summary returned"
+                    logger.error(f"Summary generation failed for page {idx}: {error}")
+                    summary_text = f"(Error summarizing page {idx}: {error})"
+                else:
+                    summary_text = result.summary
+                per_page_path = summary_dir / f"page_{idx}_summary.md"
+                write_futures.append(self._io_pool.submit(per_page_path.write_text, summary_text, encoding="utf-8"))
+                logger.info(f"Saving summary for page {idx} to {per_page_path}")
+                if idx > 1:
+                    combined_f.write("\n\n")
+                combined_f.write(f"# Page {idx} Summary\n{summary_text}")
         logger.info(f"Combined summary saved to {combined_path}")
+        for future in write_futures:
+            future.result()  # re-raises a failed write
         return combined_path
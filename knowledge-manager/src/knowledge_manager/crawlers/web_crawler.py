@@ -1,8 +1,13 @@
+from typing import Optional
+
 from crawl4ai import AsyncWebCrawler
 
 
-async def fetch_webpage_as_markdown(url):
-    async with AsyncWebCrawler() as crawler:
-        result = await crawler.arun(url=url)
-        return result.markdown
-    
\ No newline at end of file
+async def fetch_webpage_as_markdown(url, crawler: Optional[AsyncWebCrawler] = None):
+    """Fetches url with crawler when given (reusing its browser), otherwise with a browser of its own."""
+    if crawler is None:
+        async with AsyncWebCrawler() as own_crawler:
+            result = await own_crawler.arun(url=url)
+            return result.markdown
+    result = await crawler.arun(url=url)
+    return result.markdown
@@ -1,19 +1,23 @@
 import logging
 import os
 import re
-import random
+import secrets
 import string
 from datetime import datetime
 from pathlib import Path
-from time import sleep
 from typing import List, Optional
+from urllib.parse import urljoin
 import asyncio
+from crawl4ai import AsyncWebCrawler
 from dotenv import load_dotenv
+from langchain_core.runnables import Runnable
 from langchain_google_genai import ChatGoogleGenerativeAI
 from pydantic import BaseModel, Field
 
 from knowledge_manager.crawlers.web_crawler import fetch_webpage_as_markdown
+from knowledge_manager.llm_cache import LLMCache, content_hash
 from .prompts import FIND_NEXT_PAGE_SYSTEM_MSG
+from .rate_limiter import shared_rate_limiter
 
 load_dotenv()
 
@@ -37,14 +41,68 @@ class Title(BaseModel):
         description="Sanitized short folder title (letters and underscores only, 3-6 words ideally).")
 
 
+_PAGE_NUMBER_PATTERNS = [
+    re.compile(r'([?&](?:page|p)=)(\d+)'),
+    re.compile(r'(/page/)(\d+)'),
+]
+
+
+def _guess_next_page_url(url: str) -> Optional[str]:
+    """Likely next page for URLs carrying a page number (?page=N, &p=N, /page/N), else None."""
+    for pattern in _PAGE_NUMBER_PATTERNS:
+        m = pattern.search(url)
+        if m:
+            return f"{url[:m.start(2)]}{int(m.group(2)) + 1}{url[m.end(2):]}"
+    return None
+
+
+_LINK_TARGET_RE = re.compile(r'\]\(([^)\s]+)')
+_NEXT_LINK_RE = re.compile(
+    r'\[\s*(?:next(?:\s+page)?(?:\s*[»›>])?|older\s+(?:posts|entries)|[»›])\s*\]\(([^)\s]+)',
+    re.IGNORECASE,
+)
+
+
+def _find_next_link_heuristic(content: str, url: str) -> Optional[str]:
+    """
+    High-confidence next page from the page markdown alone: a link to the incremented page number,
+    or a link labelled Next / Older posts / ». None when nothing matches (ask the LLM).
+    """
+    guessed_url = _guess_next_page_url(url)
+    if guessed_url:
+        for target in _LINK_TARGET_RE.findall(content):
+            if urljoin(url, target) == guessed_url:
+                return guessed_url
+    m = _NEXT_LINK_RE.search(content)
+    if m:
+        next_url = urljoin(url, m.group(1))
+        if next_url != url:
+            return next_url
+    return None
+
+
 def _random_slug(length: int = 8) -> str:
-    return ''.join(random.choices(string.ascii_lowercase + string.ascii_uppercase, k=length))
+    # Letters only, like sanitized titles; OS entropy so concurrent runs don't pick the same name
+    return ''.join(secrets.choice(string.ascii_letters) for _ in range(length))
+
+
+_SANITIZE_RE = re.compile(r'[^A-Za-z]+')
+_MARKDOWN_LINK_RE = re.compile(r'\[([^\]]+)\]\([^)]+\)')
+
+# Pagination links sit in the header nav or the footer: the link finder only sees both ends of long pages
+_LINK_FINDER_HEAD_CHARS = 2000
+_LINK_FINDER_TAIL_CHARS = 2500
+
+
+def _pagination_snippet(content: str) -> str:
+    if len(content) <= _LINK_FINDER_HEAD_CHARS + _LINK_FINDER_TAIL_CHARS:
+        return content
+    return f"{content[:_LINK_FINDER_HEAD_CHARS]}\n...[truncated]...\n{content[-_LINK_FINDER_TAIL_CHARS:]}"
 
 
 def _sanitize_folder_name(name: str) -> str:
-    name = name.replace(' ', '_')
-    name = re.sub(r'[^A-Za-z_]', '_', name)
-    name = re.sub(r'_+', '_', name).strip('_')
+    # One pass: every run of non-letters (spaces and underscores included) becomes a single '_'
+    name = _SANITIZE_RE.sub('_', name).strip('_')
     if not name:
         name = _random_slug(6)
     return name[:60]
@@ -53,41 +111,74 @@ def _sanitize_folder_name(name: str) -> str:
 class WebCrawlerAgent:
     """Agent responsible for fetching one or multiple chained pages and organizing artifacts."""
 
-    def __init__(self, base_output_dir: str = "data", model_name: str = "gemini-2.0-flash"):
+    def __init__(
+        self,
+        base_output_dir: str = "data",
+        model_name: str = "gemini-2.0-flash",
+        use_cache: bool = True,
+        requests_per_minute: float = 15,
+    ):
         self.base_output_dir = base_output_dir
-        self.link_finder_llm = ChatGoogleGenerativeAI(model=model_name, temperature=0)
-        self.title_llm = ChatGoogleGenerativeAI(model=model_name, temperature=0)
+        self.model_name = model_name
+        # Calls go out at full speed up to the model's quota (shared with other agents using the same model);
+        # 429s are retried by the client itself (exponential backoff, honoring the server's retry delay).
+        self.rate_limiter = shared_rate_limiter(model_name, requests_per_minute / 60)
+        llm = ChatGoogleGenerativeAI(model=model_name, temperature=0, rate_limiter=self.rate_limiter)
+        # Structured-output bindings are built once, not per call
+        self._next_page_model = llm.with_structured_output(NextPage)
+        self._title_model = llm.with_structured_output(Title)
+        # Calls are deterministic (temperature=0): re-crawling the same pages reuses earlier answers
+        self.llm_cache = LLMCache() if use_cache else None
 
     # --------------- LLM helpers ---------------
-    def _find_next_link_llm(self, content: str, url: str) -> Optional[str]:
+    async def _invoke_structured(self, model: Runnable, schema: type[BaseModel], messages: list):
+        key = LLMCache.cache_key(self.model_name, messages, 0, schema.__name__)
+        if self.llm_cache is not None:
+            cached = self.llm_cache.get_structured(key, schema)
+            if cached is not None:
+                logger.info(f"LLM cache hit for {schema.__name__}")
+                return cached
+        result = await model.ainvoke(messages)
+        if self.llm_cache is not None and result is not None:
+            self.llm_cache.set_structured(key, result)
+        return result
+
+    async def _find_next_link_llm(self, content: str, url: str) -> Optional[str]:
         logger.info("Invoking LLM to find next page URL...")
-        result = self.link_finder_llm.with_structured_output(NextPage).invoke([
+        result = await self._invoke_structured(self._next_page_model, NextPage, [
             ("system", FIND_NEXT_PAGE_SYSTEM_MSG),
-            ("human", f"Page content:\n{content}\nCurrent URL: {url}"),
+            ("human", f"Page content:\n{_pagination_snippet(content)}\nCurrent URL: {url}"),
         ])
         logger.info(f"LLM next_page_url: {result.next_page_url}")
-        sleep(5)  # To avoid rate limits
         return result.next_page_url.strip() or None if result.next_page_url else None
 
-    def _generate_title(self, pages: List[str], first_url: str) -> str:
-        sample = pages[0][:4000] if pages else ""
+    async def _generate_title(self, pages: List[str], first_url: str) -> str:
+        # Link text only: the title budget goes to words, not URLs
+        sample = _MARKDOWN_LINK_RE.sub(r'\1', pages[0][:4000]) if pages else ""
         system_msg = (
             "You will create a SHORT (3-6 words) descriptive folder title for fetched web content. "
             "Allowed characters: letters and underscores."
         )
         human = f"First URL: {first_url}\nContent sample (may be truncated):\n{sample}"
         try:
-            result = self.title_llm.with_structured_output(Title).invoke([
+            result = await self._invoke_structured(self._title_model, Title, [
                 ("system", system_msg),
                 ("human", human)
             ])
-            sleep(5)  # To avoid rate limits
             raw_title = result.folder_title
         except Exception as e:  # noqa
             logger.error(f"Title generation failed: {e}; falling back to slug")
             raw_title = _random_slug(10)
         return _sanitize_folder_name(raw_title)
 
+    async def _prefetch(self, url: str, crawler: AsyncWebCrawler) -> Optional[str]:
+        """Speculative fetch: a failure only means the page is fetched again if it turns out to be needed."""
+        try:
+            return await fetch_webpage_as_markdown(url, crawler)
+        except Exception as e:  # noqa
+            logger.warning(f"Prefetch of {url} failed: {e}")
+            return None
+
     # --------------- File helpers ---------------
     def _save_content(self, content: str, directory: Path, filename: str) -> Path:
         directory.mkdir(parents=True, exist_ok=True)
@@ -108,11 +199,15 @@ class WebCrawlerAgent:
         parent = run_dir.parent
         date_stamp = datetime.now().strftime("%Y_%m_%d")
         base_name = f"{new_name}_{date_stamp}" if not new_name.endswith(date_stamp) else new_name
-        target = parent / base_name
+        # One directory scan, then pick the first free suffix in memory
+        with os.scandir(parent) as entries:
+            existing = {entry.name for entry in entries}
+        target_name = base_name
         suffix = 1
-        while target.exists():
-            target = parent / f"{base_name}_{suffix}"
+        while target_name in existing:
+            target_name = f"{base_name}_{suffix}"
             suffix += 1
+        target = parent / target_name
         try:
             run_dir.rename(target)
             return target
@@ -120,15 +215,8 @@ class WebCrawlerAgent:
             logger.error(f"Could not rename directory ({e}); keeping original {run_dir}")
             return run_dir
 
-    # --------------- Public API ---------------
-    def fetch(self, start_url: str, crawl: bool = False) -> dict:
-        """Fetch one page or crawl through paginated sequence.
-
-        Returns metadata dict with keys: run_dir, pages (list[str]), fetched_paths (list[Path])
-        """
-        run_dir = self._create_run_dir()
-        logger.info(f"Created run directory: {run_dir}")
-
+    async def _fetch_pages(self, crawler: AsyncWebCrawler, start_url: str, crawl: bool, run_dir: Path) -> tuple[List[str], List[Path]]:
+        """Fetches the start page (and with crawl, the pages after it) and saves each one under run_dir."""
         pages: List[str] = []
         fetched_paths: List[Path] = []
 
@@ -137,25 +225,62 @@ class WebCrawlerAgent:
             url = start_url
             idx = 1
             logger.info(f"Starting crawl from: {start_url}")
-            while url:
-                content = asyncio.run(fetch_webpage_as_markdown(url))  
+            content = await fetch_webpage_as_markdown(url, crawler)
+            # A page seen twice means the "next" links are cycling
+            seen_hashes = {content_hash(content)}
+            while True:
                 page_path = self._save_content(content, fetched_dir, f"page_{idx}.md")
                 fetched_paths.append(page_path)
                 pages.append(content)
-                next_url = self._find_next_link_llm(content, url)
+                guessed_url = _guess_next_page_url(url)
+                next_url = _find_next_link_heuristic(content, url)
                 if next_url:
-                    url = next_url
-                    idx += 1
+                    logger.info(f"Next page found without LLM: {next_url}")
+                    prefetched = None
+                elif guessed_url:
+                    next_url, prefetched = await asyncio.gather(
+                        self._find_next_link_llm(content, url), self._prefetch(guessed_url, crawler)
+                    )
+                else:
+                    next_url, prefetched = await self._find_next_link_llm(content, url), None
+                if not next_url:
+                    break
+                if next_url == guessed_url and prefetched is not None:
+                    logger.info(f"Using prefetched page: {next_url}")
+                    content = prefetched
                 else:
+                    content = await fetch_webpage_as_markdown(next_url, crawler)
+                page_hash = content_hash(content)
+                if page_hash in seen_hashes:
+                    logger.info(f"Page {next_url} repeats an earlier page; stopping crawl.")
                     break
+                seen_hashes.add(page_hash)
+                url = next_url
+                idx += 1
         else:
             logger.info(f"Fetching single page: {start_url}")
-            content = asyncio.run(fetch_webpage_as_markdown(start_url))  
+            content = await fetch_webpage_as_markdown(start_url, crawler)
             page_path = self._save_content(content, run_dir, "raw.md")
             fetched_paths.append(page_path)
             pages.append(content)
+        return pages, fetched_paths
+
+    # --------------- Public API ---------------
+    async def fetch(self, start_url: str, crawl: bool = False) -> dict:
+        """Fetch one page or crawl through paginated sequence.
+
+        While the LLM looks for the next link, the page-numbered guess for it (if any) is fetched
+        concurrently and reused when the LLM picks that URL.
+
+        Returns metadata dict with keys: run_dir, pages (list[str]), fetched_paths (list[Path])
+        """
+        run_dir = self._create_run_dir()
+        logger.info(f"Created run directory: {run_dir}")
+        # One browser for every page of this run, closed before title generation (and on error)
+        async with AsyncWebCrawler() as crawler:
+            pages, fetched_paths = await self._fetch_pages(crawler, start_url, crawl, run_dir)
 
-        folder_title = self._generate_title(pages, start_url)
+        folder_title = await self._generate_title(pages, start_url)
         logger.info(f"Generated folder title: {folder_title}")
         new_run_dir = self._rename_run_dir(run_dir, folder_title)
         if new_run_dir != run_dir:
@@ -0,0 +1,80 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Optional, TypeVar
+
+from pydantic import BaseModel
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 of text with whitespace runs collapsed, so re-rendered copies of the same page hash alike."""
+    normalized = _WHITESPACE_RE.sub(" ", text).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    Local cache of model responses, keyed by a SHA-256 of the request.
+    Backed by sqlite in WAL mode so concurrent workers (and processes) can read while one writes.
+    """
+
+    def __init__(self, path: str = ".llm_cache.sqlite", ttl_seconds: Optional[float] = None):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        # One connection shared by worker threads; the lock serializes statements on it
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def cache_key(model: str, messages: Any, temperature: float, schema_name: Optional[str] = None) -> str:
+        """Stable key for a request: same model, prompt, temperature and output schema give the same key."""
+        payload = json.dumps(
+            {"model": model, "messages": messages, "temperature": temperature, "schema": schema_name},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, created_at = row
+        if self.ttl_seconds is not None and time.time() - created_at > self.ttl_seconds:
+            return None
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at) VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+            self._conn.commit()
+
+    def get_structured(self, key: str, schema: type[ModelT]) -> Optional[ModelT]:
+        """Cached structured-output response, validated back into schema."""
+        value = self.get(key)
+        return schema.model_validate_json(value) if value is not None else None
+
+    def set_structured(self, key: str, value: BaseModel) -> None:
+        self.set(key, value.model_dump_json())
+
+    def close(self) -> None:
+        self._conn.close()